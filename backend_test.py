@@ -1,7 +1,29 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
+import os
 import json
-from datetime import datetime
+import math
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import logging
+
+from http_helpers import dumps_body, loads_body, buffered_logger, flush_log
+
+# Fixed fields of the update-solution payload; only question_id varies per call
+UPDATE_SOLUTION_FIELDS = {
+    "answer": "1",
+    "solution": "To find the harmonic mean of numbers a, b, c: HM = 3/(1/a + 1/b + 1/c). For 4, 6, 12: HM = 3/(1/4 + 1/6 + 1/12) = 3/(3/12 + 2/12 + 1/12) = 3/(6/12) = 3/(1/2) = 6. The answer is option 1 (6).",
+    "confidence_level": "High"
+}
+
+# Per-attempt progress goes through a buffered logger instead of one print per line;
+# detail lines are DEBUG and only shown with --verbose
+log = buffered_logger('pyq', capacity=512)
 
 class QuestionMakerAPITester:
     def __init__(self, base_url="https://testsmith-1.preview.emergentagent.com"):
@@ -11,11 +33,37 @@ class QuestionMakerAPITester:
         self.tests_passed = 0
         self.failed_tests = []
         self.test_results = {}
+        self.lock = threading.Lock()
+        
+        # One pooled session for every call so keep-alive connections are reused
+        self.session = requests.Session()
+        # Only idempotent reads are retried (urllib3's default methods), and only on connection
+        # errors or gateway-level 5xx; a plain 500 is the API's own error signal and several
+        # tests assert on it. POST/PATCH are never re-sent, so a slow write cannot be duplicated
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+        # The root ping gets no retries at all, so an unreachable host costs one timeout
+        self._ping_session = requests.Session()
+        self._ping_session.mount('http://', HTTPAdapter(max_retries=0))
+        self._ping_session.mount('https://', HTTPAdapter(max_retries=0))
+        
+        # Per-endpoint request latencies in nanoseconds
+        self.timings = defaultdict(list)
+        
+        # Encoded generate-pyq-solution bodies per topic, with a {N} attempt placeholder
+        self._pyq_body_templates = {}
+        
+        # Cached (success, data) from the root ping
+        self._root_result = None
 
-    def run_test(self, name, method, endpoint, expected_status, data=None, params=None):
-        """Run a single API test"""
+    def run_test(self, name, method, endpoint, expected_status, data=None, params=None, timeout=30, session=None):
+        """Run a single API test, through the shared session unless another is given"""
         url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
+        session = session or self.session
 
         self.tests_run += 1
         print(f"\n🔍 Testing {name}...")
@@ -23,9 +71,9 @@ class QuestionMakerAPITester:
         
         try:
             if method == 'GET':
-                response = requests.get(url, headers=headers, params=params, timeout=30)
+                response = session.get(url, params=params, timeout=timeout)
             elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=30)
+                response = session.post(url, json=data, timeout=timeout)
 
             success = response.status_code == expected_status
             
@@ -57,9 +105,84 @@ class QuestionMakerAPITester:
             })
             return False, {}
 
+    def _format_session(self, data):
+        """Format the common session fields of a start-auto-generation response"""
+        return '\n'.join(f"   {label}: {data.get(key, 'N/A')}" for label, key in [
+            ('Session ID', 'session_id'),
+            ('Total topics', 'total_topics'),
+            ('Status', 'status')
+        ])
+
+    def close(self):
+        """Release the pooled connections held by the shared and ping sessions"""
+        self.session.close()
+        self._ping_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _timed(self, endpoint, method, url, **kwargs):
+        """Issue a session request and record its latency under endpoint"""
+        start = time.perf_counter_ns()
+        try:
+            response = getattr(self.session, method)(url, **kwargs)
+            log.debug("      %s Content-Encoding: %s", endpoint,
+                      response.headers.get('Content-Encoding', 'identity'))
+            return response
+        finally:
+            self.timings[endpoint].append(time.perf_counter_ns() - start)
+
+    def _latency_percentiles(self, samples_ns):
+        """Return (p50, p95) in milliseconds for a list of nanosecond samples"""
+        if len(samples_ns) < 2:
+            return samples_ns[0] / 1e6, samples_ns[0] / 1e6
+        p95 = statistics.quantiles(samples_ns, n=20)[18]
+        return statistics.median(samples_ns) / 1e6, p95 / 1e6
+
+    def _success_rate_interval(self, successes, attempts, z=1.96):
+        """95% Wilson score interval (low, high) for an observed success rate.
+        
+        Unlike the Wald interval it does not collapse to a point at 0/n or n/n,
+        so a handful of identical outcomes is not mistaken for a verdict.
+        """
+        p_hat = successes / attempts
+        denom = 1 + z * z / attempts
+        center = (p_hat + z * z / (2 * attempts)) / denom
+        half = z * math.sqrt(p_hat * (1 - p_hat) / attempts + z * z / (4 * attempts * attempts)) / denom
+        return max(0.0, center - half), min(1.0, center + half)
+
+    def _success_rate_decided(self, low, high, band=(0.20, 0.50)):
+        """Whether the interval sits clearly above, below or inside the expected band"""
+        return low > band[1] or high < band[0] or (band[0] <= low and high <= band[1])
+
+    def _response_head(self, response, limit=200):
+        """Decode at most `limit` bytes of a (streamed) response body without reading the rest"""
+        chunk = next(response.iter_content(chunk_size=limit), b'')
+        response.close()
+        return chunk[:limit].decode(response.encoding or 'utf-8', 'replace')
+
+    def warm_up(self, connections=4):
+        """Open `connections` pooled keep-alive connections (DNS, TCP and TLS) before the timed phases"""
+        def ping():
+            try:
+                self.session.get(f"{self.api_url}/", timeout=2).close()
+            except requests.RequestException:
+                pass
+        
+        # Concurrent so the pool holds that many live connections, not one reused repeatedly
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            for _ in range(connections):
+                executor.submit(ping)
+
     def test_root_endpoint(self):
-        """Test the root API endpoint"""
-        return self.run_test("Root API", "GET", "", 200)
+        """Test the root API endpoint; the first result is reused so later phases don't re-probe"""
+        if self._root_result is None:
+            # A short timeout: if the backend is down every later call would wait out its own
+            self._root_result = self.run_test("Root API", "GET", "", 200, timeout=2, session=self._ping_session)
+        return self._root_result
 
     def test_exams_endpoint(self):
         """Test getting all exams"""
@@ -143,7 +266,6 @@ class QuestionMakerAPITester:
         }
         
         url = f"{self.api_url}/generate-question"
-        headers = {'Content-Type': 'application/json'}
         
         self.tests_run += 1
         print(f"\n🔍 Testing Generate {question_type} Question for Topic {topic_id}...")
@@ -151,7 +273,7 @@ class QuestionMakerAPITester:
         print(f"   Request: {json.dumps(request_data, indent=2)}")
         
         try:
-            response = requests.post(url, json=request_data, headers=headers, timeout=60)
+            response = self.session.post(url, json=request_data, timeout=60)
             
             print(f"   Status Code: {response.status_code}")
             print(f"   Response Headers: {dict(response.headers)}")
@@ -315,7 +437,6 @@ class QuestionMakerAPITester:
         }
         
         url = f"{self.api_url}/generate-pyq-solution"
-        headers = {'Content-Type': 'application/json'}
         
         self.tests_run += 1
         print(f"\n🔍 Testing Generate PYQ Solution for Topic {topic_id}...")
@@ -323,7 +444,7 @@ class QuestionMakerAPITester:
         print(f"   Request: {json.dumps(request_data, indent=2)}")
         
         try:
-            response = requests.post(url, json=request_data, headers=headers, timeout=60)
+            response = self.session.post(url, json=request_data, timeout=60)
             
             print(f"   Status Code: {response.status_code}")
             
@@ -424,14 +545,13 @@ class QuestionMakerAPITester:
         }
         
         url = f"{self.api_url}/start-auto-generation"
-        headers = {'Content-Type': 'application/json'}
         
         print(f"   URL: {url}")
         print(f"   Params: {params}")
         print(f"   Body: {json.dumps(request_data, indent=2)}")
         
         try:
-            response = requests.post(url, json=request_data, headers=headers, params=params, timeout=30)
+            response = self.session.post(url, json=request_data, params=params, timeout=30)
             print(f"   Status Code: {response.status_code}")
             print(f"   Response Headers: {dict(response.headers)}")
             print(f"   Raw Response: {response.text}")
@@ -492,7 +612,7 @@ class QuestionMakerAPITester:
         for test_case in invalid_requests:
             print(f"\n   Testing: {test_case['name']}")
             try:
-                response = requests.post(url, json=test_case['data'], headers=headers, params=test_case['params'], timeout=30)
+                response = self.session.post(url, json=test_case['data'], params=test_case['params'], timeout=30)
                 print(f"   Status: {response.status_code}")
                 print(f"   Response: {response.text[:300]}...")
                 
@@ -517,7 +637,7 @@ class QuestionMakerAPITester:
         
         # Get exams
         try:
-            exams_response = requests.get(f"{self.api_url}/exams", headers=headers, timeout=30)
+            exams_response = self.session.get(f"{self.api_url}/exams", timeout=30)
             if exams_response.status_code == 200:
                 exams = exams_response.json()
                 print(f"   Found {len(exams)} exams:")
@@ -530,7 +650,7 @@ class QuestionMakerAPITester:
                     print(f"\n   Testing with real exam_id: {real_exam_id}")
                     
                     # Get courses for this exam
-                    courses_response = requests.get(f"{self.api_url}/courses/{real_exam_id}", headers=headers, timeout=30)
+                    courses_response = self.session.get(f"{self.api_url}/courses/{real_exam_id}", timeout=30)
                     if courses_response.status_code == 200:
                         courses = courses_response.json()
                         print(f"   Found {len(courses)} courses for this exam:")
@@ -549,7 +669,7 @@ class QuestionMakerAPITester:
                                 "generation_mode": "new_questions"
                             }
                             
-                            response = requests.post(url, json=request_data, headers=headers, params=real_params, timeout=30)
+                            response = self.session.post(url, json=request_data, params=real_params, timeout=30)
                             print(f"   Status: {response.status_code}")
                             print(f"   Response: {response.text}")
                             
@@ -573,7 +693,7 @@ class QuestionMakerAPITester:
             
             for course_id in test_course_ids:
                 print(f"\n   Testing with course_id: {course_id}")
-                response = requests.get(f"{self.api_url}/all-topics-with-weightage/{course_id}", headers=headers, timeout=30)
+                response = self.session.get(f"{self.api_url}/all-topics-with-weightage/{course_id}", timeout=30)
                 print(f"   Status: {response.status_code}")
                 print(f"   Response: {response.text[:300]}...")
                 
@@ -770,7 +890,6 @@ class QuestionMakerAPITester:
         }
         
         url = f"{self.api_url}/start-auto-generation"
-        headers = {'Content-Type': 'application/json'}
         
         self.tests_run += 1
         print(f"   Testing with generation_mode='{generation_mode}'...")
@@ -778,16 +897,14 @@ class QuestionMakerAPITester:
         print(f"   Params: {params}")
         
         try:
-            response = requests.post(url, json=request_data, headers=headers, params=params, timeout=30)
+            response = self.session.post(url, json=request_data, params=params, timeout=30)
             
             if response.status_code == 200:
                 self.tests_passed += 1
                 print(f"   ✅ SUCCESS - Auto-generation session created!")
                 try:
                     response_data = response.json()
-                    print(f"   Session ID: {response_data.get('session_id', 'N/A')}")
-                    print(f"   Total topics: {response_data.get('total_topics', 'N/A')}")
-                    print(f"   Status: {response_data.get('status', 'N/A')}")
+                    print(self._format_session(response_data))
                     print(f"   Message: {response_data.get('message', 'N/A')}")
                     return True, response_data
                 except Exception as json_error:
@@ -832,24 +949,29 @@ class QuestionMakerAPITester:
             })
             return False, {}
 
-    def test_existing_questions_with_ids(self, topic_id):
-        """Test existing-questions endpoint and verify it returns question IDs"""
+    def test_existing_questions_with_ids(self, topic_id, out=print):
+        """Test existing-questions endpoint and verify it returns question IDs.
+        
+        Output goes through `out`; pass a list's append to collect it when this runs
+        alongside other calls.
+        """
         url = f"{self.api_url}/existing-questions/{topic_id}"
-        headers = {'Content-Type': 'application/json'}
         
-        self.tests_run += 1
-        print(f"   Testing existing-questions endpoint...")
-        print(f"   URL: {url}")
+        with self.lock:
+            self.tests_run += 1
+        out(f"   Testing existing-questions endpoint...")
+        out(f"   URL: {url}")
         
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._timed('existing-questions', 'get', url, timeout=30)
             
             if response.status_code == 200:
-                self.tests_passed += 1
-                print(f"   ✅ SUCCESS - Existing questions retrieved!")
+                with self.lock:
+                    self.tests_passed += 1
+                out(f"   ✅ SUCCESS - Existing questions retrieved!")
                 try:
                     response_data = response.json()
-                    print(f"   Found {len(response_data)} existing questions")
+                    out(f"   Found {len(response_data)} existing questions")
                     
                     # Verify questions have IDs and other required data
                     if response_data:
@@ -858,22 +980,22 @@ class QuestionMakerAPITester:
                         has_statement = 'question_statement' in sample_question
                         has_type = 'question_type' in sample_question
                         
-                        print(f"   Sample question has ID: {has_id}")
-                        print(f"   Sample question has statement: {has_statement}")
-                        print(f"   Sample question has type: {has_type}")
+                        out(f"   Sample question has ID: {has_id}")
+                        out(f"   Sample question has statement: {has_statement}")
+                        out(f"   Sample question has type: {has_type}")
                         
                         if has_id:
-                            print(f"   Sample question ID: {sample_question['id']}")
+                            out(f"   Sample question ID: {sample_question['id']}")
                         if has_statement:
-                            print(f"   Sample statement: {sample_question['question_statement'][:100]}...")
+                            out(f"   Sample statement: {sample_question['question_statement'][:100]}...")
                     
                     return True, response_data
                 except Exception as json_error:
-                    print(f"   ❌ JSON parsing error: {str(json_error)}")
+                    out(f"   ❌ JSON parsing error: {str(json_error)}")
                     return False, {}
             else:
-                print(f"   ❌ FAILED - Expected 200, got {response.status_code}")
-                print(f"   Response: {response.text}")
+                out(f"   ❌ FAILED - Expected 200, got {response.status_code}")
+                out(f"   Response: {response.text}")
                 self.failed_tests.append({
                     'test': "Existing Questions with IDs",
                     'topic_id': topic_id,
@@ -884,7 +1006,7 @@ class QuestionMakerAPITester:
                 return False, {}
                 
         except Exception as e:
-            print(f"   ❌ EXCEPTION - Error: {str(e)}")
+            out(f"   ❌ EXCEPTION - Error: {str(e)}")
             self.failed_tests.append({
                 'test': "Existing Questions with IDs",
                 'topic_id': topic_id,
@@ -902,7 +1024,6 @@ class QuestionMakerAPITester:
         }
         
         url = f"{self.api_url}/update-question-solution"
-        headers = {'Content-Type': 'application/json'}
         
         self.tests_run += 1
         print(f"   Testing update-question-solution endpoint...")
@@ -910,7 +1031,7 @@ class QuestionMakerAPITester:
         print(f"   Question ID: {question_id}")
         
         try:
-            response = requests.patch(url, json=request_data, headers=headers, timeout=30)
+            response = self.session.patch(url, json=request_data, timeout=30)
             
             if response.status_code == 200:
                 self.tests_passed += 1
@@ -1268,9 +1389,7 @@ class QuestionMakerAPITester:
             print(f"   ✅ SUCCESS: No validation error about missing required fields!")
             print(f"   ✅ snake_case fields (correct_marks, incorrect_marks, etc.) accepted properly")
             if data1:
-                print(f"   Session ID: {data1.get('session_id', 'N/A')}")
-                print(f"   Total topics: {data1.get('total_topics', 'N/A')}")
-                print(f"   Status: {data1.get('status', 'N/A')}")
+                print(self._format_session(data1))
         else:
             print(f"   ❌ FAILED: Validation error still occurs")
         
@@ -1283,9 +1402,7 @@ class QuestionMakerAPITester:
             print(f"   ✅ SUCCESS: No validation error about missing required fields!")
             print(f"   ✅ snake_case fields accepted properly for pyq_solutions mode")
             if data2:
-                print(f"   Session ID: {data2.get('session_id', 'N/A')}")
-                print(f"   Total topics: {data2.get('total_topics', 'N/A')}")
-                print(f"   Status: {data2.get('status', 'N/A')}")
+                print(self._format_session(data2))
         else:
             print(f"   ❌ FAILED: Validation error still occurs")
         
@@ -1315,14 +1432,17 @@ class QuestionMakerAPITester:
         print(f"\n📊 CAMELCASE TO SNAKE_CASE FIX TEST SUMMARY")
         print("=" * 60)
         
-        snake_case_working = results.get('new_questions_mode', {}).get('success', False) and \
-                           results.get('pyq_solutions_mode', {}).get('success', False)
-        
+        nq_ok = results.get('new_questions_mode', {}).get('success', False)
+        pq_ok = results.get('pyq_solutions_mode', {}).get('success', False)
+        snake_case_working = nq_ok and pq_ok
         camelcase_properly_rejected = not results.get('camelcase_negative_test', {}).get('success', True)
         
-        print(f"✅ snake_case format accepted: {'YES' if snake_case_working else 'NO'}")
-        print(f"✅ camelCase format rejected: {'YES' if camelcase_properly_rejected else 'NO'}")
-        print(f"✅ Both generation modes working: {'YES' if snake_case_working else 'NO'}")
+        snake_label = 'YES' if snake_case_working else 'NO'
+        camel_label = 'YES' if camelcase_properly_rejected else 'NO'
+        
+        print(f"✅ snake_case format accepted: {snake_label}")
+        print(f"✅ camelCase format rejected: {camel_label}")
+        print(f"✅ Both generation modes working: {snake_label}")
         
         if snake_case_working and camelcase_properly_rejected:
             print(f"\n✅ CAMELCASE TO SNAKE_CASE FIX: WORKING CORRECTLY!")
@@ -1347,7 +1467,6 @@ class QuestionMakerAPITester:
         }
         
         url = f"{self.api_url}/start-auto-generation"
-        headers = {'Content-Type': 'application/json'}
         
         self.tests_run += 1
         print(f"   Testing with generation_mode='{generation_mode}' and specific config...")
@@ -1356,16 +1475,14 @@ class QuestionMakerAPITester:
         print(f"   Config: {config_data}")
         
         try:
-            response = requests.post(url, json=config_data, headers=headers, params=params, timeout=30)
+            response = self.session.post(url, json=config_data, params=params, timeout=30)
             
             if response.status_code == 200:
                 self.tests_passed += 1
                 print(f"   ✅ SUCCESS - Auto-generation session created!")
                 try:
                     response_data = response.json()
-                    print(f"   Session ID: {response_data.get('session_id', 'N/A')}")
-                    print(f"   Total topics: {response_data.get('total_topics', 'N/A')}")
-                    print(f"   Status: {response_data.get('status', 'N/A')}")
+                    print(self._format_session(response_data))
                     return True, response_data
                 except Exception as json_error:
                     print(f"   ❌ JSON parsing error: {str(json_error)}")
@@ -1506,16 +1623,18 @@ class QuestionMakerAPITester:
         print(f"Successful tests: {successful_tests}/{total_tests}")
         
         # Check specific requirements
-        both_modes_working = results.get('new_questions_mode', {}).get('success', False) and \
-                           results.get('pyq_solutions_mode', {}).get('success', False)
+        nq_ok = results.get('new_questions_mode', {}).get('success', False)
+        pq_ok = results.get('pyq_solutions_mode', {}).get('success', False)
+        both_modes_working = nq_ok and pq_ok
         
         question_generation_working = any(results.get(f'generate_{q_type}', {}).get('success', False) 
                                         for q_type in ['mcq', 'msq', 'nat'])
+        saved_ok = results.get('verify_saved_questions', {}).get('success', False)
         
         print(f"\n🎯 SPECIFIC REQUIREMENTS CHECK:")
         print(f"   Both generation modes working: {'✅ YES' if both_modes_working else '❌ NO'}")
         print(f"   Question generation working: {'✅ YES' if question_generation_working else '❌ NO'}")
-        print(f"   Questions saved to database: {'✅ YES' if results.get('verify_saved_questions', {}).get('success', False) else '❌ NO'}")
+        print(f"   Questions saved to database: {'✅ YES' if saved_ok else '❌ NO'}")
         
         if both_modes_working and question_generation_working:
             print(f"\n✅ REVIEW REQUEST: AUTO-GENERATION SYSTEM IS WORKING CORRECTLY!")
@@ -1580,6 +1699,16 @@ class QuestionMakerAPITester:
         success, data = self.detailed_start_auto_generation_test(request_data, params, "pyq_solutions")
         results['valid_pyq_solutions'] = {'success': success, 'data': data}
         
+        # A validation error array in either valid call already proves the '[object Object]' hypothesis
+        detected = any(
+            isinstance(results[key].get('data', {}).get('error_response_parsed', {}).get('detail'), list)
+            for key in ('valid_new_questions', 'valid_pyq_solutions')
+        )
+        if detected and os.environ.get('FAST_FAIL', '1') == '1':
+            print(f"\n⏭️ Early-exit: [object Object] shape confirmed")
+            results['invalid_scenarios'].append({'skipped': True})
+            return results
+        
         # Test 3: Invalid scenarios that might cause '[object Object]' error
         print(f"\n3️⃣ Testing INVALID scenarios that cause '[object Object]' error")
         
@@ -1631,7 +1760,6 @@ class QuestionMakerAPITester:
     def detailed_start_auto_generation_test(self, request_data, params, test_name):
         """Detailed test of start-auto-generation endpoint with error analysis"""
         url = f"{self.api_url}/start-auto-generation"
-        headers = {'Content-Type': 'application/json'}
         
         self.tests_run += 1
         print(f"   URL: {url}")
@@ -1639,7 +1767,7 @@ class QuestionMakerAPITester:
         print(f"   Body: {json.dumps(request_data, indent=6)}")
         
         try:
-            response = requests.post(url, json=request_data, headers=headers, params=params, timeout=30)
+            response = self.session.post(url, json=request_data, params=params, timeout=30)
             
             print(f"   Status Code: {response.status_code}")
             print(f"   Response Headers: {dict(response.headers)}")
@@ -1665,6 +1793,7 @@ class QuestionMakerAPITester:
                 print(f"   Raw Response: {response.text}")
                 
                 # Detailed error analysis for '[object Object]' investigation
+                error_data = None
                 try:
                     error_data = response.json()
                     print(f"   📊 ERROR ANALYSIS:")
@@ -1710,7 +1839,11 @@ class QuestionMakerAPITester:
                     'response': response.text[:500],
                     'params': params
                 })
-                return False, {'error_response': response.text, 'status_code': response.status_code}
+                return False, {
+                    'error_response': response.text,
+                    'error_response_parsed': error_data if isinstance(error_data, dict) else {},
+                    'status_code': response.status_code
+                }
                 
         except Exception as e:
             print(f"   ❌ EXCEPTION - Error: {str(e)}")
@@ -1800,8 +1933,11 @@ class QuestionMakerAPITester:
         
         return results
 
-    def test_question_generation_detailed(self, topic_id, question_type):
-        """Test question generation with detailed error analysis for database constraints"""
+    def test_question_generation_detailed(self, topic_id, question_type, out=print):
+        """Test question generation with detailed error analysis for database constraints.
+        
+        Output goes through `out`, as in test_existing_questions_with_ids.
+        """
         request_data = {
             "topic_id": topic_id,
             "question_type": question_type,
@@ -1810,57 +1946,60 @@ class QuestionMakerAPITester:
         }
         
         url = f"{self.api_url}/generate-question"
-        headers = {'Content-Type': 'application/json'}
         
-        self.tests_run += 1
-        print(f"🔍 Testing Generate {question_type} Question...")
-        print(f"   URL: {url}")
-        print(f"   Topic ID: {topic_id}")
-        print(f"   Request: {json.dumps(request_data, indent=2)}")
+        with self.lock:
+            self.tests_run += 1
+        out(f"🔍 Testing Generate {question_type} Question...")
+        out(f"   URL: {url}")
+        out(f"   Topic ID: {topic_id}")
+        out(f"   Request: {json.dumps(request_data, indent=2)}")
         
         try:
-            response = requests.post(url, json=request_data, headers=headers, timeout=60)
+            response = self._timed('generate-question', 'post', url, data=dumps_body(request_data), timeout=60, stream=True)
             
-            print(f"   Status Code: {response.status_code}")
+            out(f"   Status Code: {response.status_code}")
             
             if response.status_code == 200:
-                self.tests_passed += 1
-                print(f"✅ SUCCESS - {question_type} question generated successfully!")
+                with self.lock:
+                    self.tests_passed += 1
+                out(f"✅ SUCCESS - {question_type} question generated successfully!")
                 try:
-                    response_data = response.json()
-                    print(f"   Generated Question: {response_data.get('question_statement', '')[:150]}...")
-                    print(f"   Question Type: {response_data.get('question_type', 'N/A')}")
-                    print(f"   Answer: {response_data.get('answer', 'N/A')}")
-                    print(f"   Difficulty: {response_data.get('difficulty_level', 'N/A')}")
+                    response_data = loads_body(response.content)
+                    out(f"   Generated Question: {response_data.get('question_statement', '')[:150]}...")
+                    out(f"   Question Type: {response_data.get('question_type', 'N/A')}")
+                    out(f"   Answer: {response_data.get('answer', 'N/A')}")
+                    out(f"   Difficulty: {response_data.get('difficulty_level', 'N/A')}")
                     return True, response_data
                 except Exception as json_error:
-                    print(f"❌ JSON parsing error: {str(json_error)}")
-                    return False, {}
+                    out(f"❌ JSON parsing error: {str(json_error)}")
+                    return False, {'error': 'json_parsing', 'details': str(json_error)}
             else:
-                print(f"❌ FAILED - Expected 200, got {response.status_code}")
-                print(f"   Error Response: {response.text}")
+                out(f"❌ FAILED - Expected 200, got {response.status_code}")
+                # Error bodies are small JSON, but cap the read in case an upstream HTML page comes back
+                error_text = self._response_head(response, 4096)
+                out(f"   Error Response: {error_text}")
                 
                 # Detailed error analysis for database constraints
                 try:
-                    error_data = response.json()
+                    error_data = json.loads(error_text)
                     error_detail = error_data.get('detail', 'No detail provided')
-                    print(f"   Error Detail: {error_detail}")
+                    out(f"   Error Detail: {error_detail}")
                     
                     # Check for specific database constraint errors
                     if 'constraint' in error_detail.lower():
-                        print(f"   🔍 DATABASE CONSTRAINT ERROR DETECTED!")
+                        out(f"   🔍 DATABASE CONSTRAINT ERROR DETECTED!")
                         if 'new_questions_question_type_check' in error_detail:
-                            print(f"   🎯 SPECIFIC CONSTRAINT: new_questions_question_type_check")
-                            print(f"   📝 ANALYSIS: Database schema doesn't allow '{question_type}' as valid question_type")
-                            print(f"   💡 SOLUTION: Need to update database constraint to include '{question_type}'")
+                            out(f"   🎯 SPECIFIC CONSTRAINT: new_questions_question_type_check")
+                            out(f"   📝 ANALYSIS: Database schema doesn't allow '{question_type}' as valid question_type")
+                            out(f"   💡 SOLUTION: Need to update database constraint to include '{question_type}'")
                         
                     # Check for JSON parsing errors
                     elif 'json' in error_detail.lower() or 'parsing' in error_detail.lower():
-                        print(f"   🔍 JSON PARSING ERROR DETECTED!")
-                        print(f"   📝 ANALYSIS: Gemini API response format issue")
+                        out(f"   🔍 JSON PARSING ERROR DETECTED!")
+                        out(f"   📝 ANALYSIS: Gemini API response format issue")
                         
                 except Exception as parse_error:
-                    print(f"   ⚠️ Could not parse error response: {parse_error}")
+                    out(f"   ⚠️ Could not parse error response: {parse_error}")
                 
                 self.failed_tests.append({
                     'test': f"Generate {question_type} Question (Detailed)",
@@ -1868,63 +2007,74 @@ class QuestionMakerAPITester:
                     'question_type': question_type,
                     'expected': 200,
                     'actual': response.status_code,
-                    'response': response.text[:500]
+                    'response': error_text[:500]
                 })
-                return False, {}
+                return False, {'error': 'http_error', 'status': response.status_code, 'details': error_text[:500]}
                 
         except Exception as e:
-            print(f"❌ EXCEPTION - Error: {str(e)}")
+            out(f"❌ EXCEPTION - Error: {str(e)}")
             self.failed_tests.append({
                 'test': f"Generate {question_type} Question (Detailed)",
                 'topic_id': topic_id,
                 'question_type': question_type,
                 'error': str(e)
             })
-            return False, {}
+            return False, {'error': 'exception', 'details': str(e)}
 
     def investigate_database_constraint(self):
         """Investigate what question types are allowed by the database constraint"""
         print(f"\n🔍 INVESTIGATING DATABASE CONSTRAINT...")
         print("   Attempting to understand what question types are allowed...")
         
-        # Try to generate questions of known working types to understand the pattern
+        # Probe every type in one concurrent wave; each probe handles its own errors
+        # so one failure cannot hide the others
         topic_id = "7c583ed3-64bf-4fa0-bf20-058ac4b40737"
-        working_types = []
+        probe_types = ["MCQ", "MSQ", "NAT", "SUB"]
         
-        for q_type in ["MCQ", "MSQ", "NAT"]:
-            print(f"   Testing {q_type} to confirm it works...")
-            try:
-                request_data = {
-                    "topic_id": topic_id,
-                    "question_type": q_type,
-                    "part_id": None,
-                    "slot_id": None
-                }
-                
-                url = f"{self.api_url}/generate-question"
-                headers = {'Content-Type': 'application/json'}
-                
-                response = requests.post(url, json=request_data, headers=headers, timeout=30)
-                
-                if response.status_code == 200:
-                    working_types.append(q_type)
-                    print(f"   ✅ {q_type}: WORKS")
-                else:
-                    print(f"   ❌ {q_type}: FAILS - {response.status_code}")
-                    
-            except Exception as e:
-                print(f"   ❌ {q_type}: ERROR - {str(e)}")
+        with ThreadPoolExecutor(max_workers=len(probe_types)) as executor:
+            outcomes = list(executor.map(lambda q_type: self._probe_question_type(topic_id, q_type), probe_types))
+        
+        working_types = [q_type for q_type, works in zip(probe_types, outcomes) if works]
+        failing_types = [q_type for q_type, works in zip(probe_types, outcomes) if not works]
         
         print(f"\n📊 CONSTRAINT ANALYSIS RESULTS:")
         print(f"   Working question types: {working_types}")
-        print(f"   Failing question types: ['SUB']")
+        print(f"   Failing question types: {failing_types}")
         print(f"   Constraint allows: {', '.join(working_types)}")
-        print(f"   Constraint rejects: SUB")
-        print(f"\n💡 RECOMMENDATION:")
-        print(f"   Update database constraint 'new_questions_question_type_check'")
-        print(f"   to include 'SUB' as a valid question_type value")
-        print(f"   Current allowed values appear to be: {', '.join(working_types)}")
-        print(f"   Required change: Add 'SUB' to the allowed values list")
+        print(f"   Constraint rejects: {', '.join(failing_types) or 'None'}")
+        if failing_types:
+            print(f"\n💡 RECOMMENDATION:")
+            print(f"   Update database constraint 'new_questions_question_type_check'")
+            print(f"   to include {', '.join(repr(t) for t in failing_types)} as valid question_type values")
+            print(f"   Current allowed values appear to be: {', '.join(working_types)}")
+            print(f"   Required change: Add {', '.join(repr(t) for t in failing_types)} to the allowed values list")
+        
+        return working_types, failing_types
+
+    def _probe_question_type(self, topic_id, q_type):
+        """Generate one question of q_type and report whether the backend accepted it"""
+        print(f"   Testing {q_type} to confirm it works...")
+        try:
+            request_data = {
+                "topic_id": topic_id,
+                "question_type": q_type,
+                "part_id": None,
+                "slot_id": None
+            }
+            
+            url = f"{self.api_url}/generate-question"
+            
+            response = self.session.post(url, json=request_data, timeout=30)
+            
+            if response.status_code == 200:
+                print(f"   ✅ {q_type}: WORKS")
+                return True
+            else:
+                print(f"   ❌ {q_type}: FAILS - {response.status_code}")
+                
+        except Exception as e:
+            print(f"   ❌ {q_type}: ERROR - {str(e)}")
+        return False
 
     def test_pyq_solution_generation_comprehensive(self):
         """Comprehensive testing of PYQ solution generation system as requested"""
@@ -1939,18 +2089,30 @@ class QuestionMakerAPITester:
         
         results = {
             'existing_questions_tests': [],
-            'generate_pyq_solution_tests': [],
             'generate_pyq_solution_by_id_tests': [],
             'update_question_solution_tests': [],
             'generate_question_tests': [],
             'data_saving_tests': []
         }
         
+        # Phases 1 and 5 hit disjoint endpoints, so send them as one concurrent wave up front.
+        # Phases 3/4 need phase 1's questions and phase 6 verifies phase 5's writes, so those wait.
+        # Each call's output is collected and printed under its own phase heading.
+        question_types = ["MCQ", "MSQ", "NAT"]  # Avoid SUB due to database constraint
+        existing_lines = []
+        generation_lines = {q_type: [] for q_type in question_types}
+        wave = ThreadPoolExecutor(max_workers=1 + len(question_types))
+        existing_future = wave.submit(self.test_existing_questions_with_ids, topic_id, existing_lines.append)
+        generation_futures = [wave.submit(self.test_question_generation_detailed, topic_id, q_type, generation_lines[q_type].append)
+                              for q_type in question_types]
+        wave.shutdown(wait=False)
+        
         # 1. Test GET /api/existing-questions/{topic_id}
         print(f"\n1️⃣ Testing GET /api/existing-questions/{topic_id}")
         print("   Purpose: Get PYQ questions from questions_topic_wise table")
         
-        success, existing_questions = self.test_existing_questions_with_ids(topic_id)
+        success, existing_questions = existing_future.result()
+        print('\n'.join(existing_lines))
         results['existing_questions_tests'].append({
             'success': success,
             'data': existing_questions,
@@ -1975,37 +2137,60 @@ class QuestionMakerAPITester:
         pyq_json_errors = 0
         pyq_other_errors = 0
         
-        for i in range(6):  # Test 6 times to get better statistics
-            print(f"\n   PYQ Solution Attempt {i+1}/6:")
-            success, data = self.test_generate_pyq_solution_detailed(topic_id, i+1)
+        # Up to 6 attempts in two concurrent waves of 3. The second wave is skipped only if
+        # the Wilson interval after the first already clears the 20-50% band; at n=3 it
+        # never does, so in practice both waves run, side by side rather than one by one
+        wave_size, max_attempts = 3, 6
+        outcomes = []
+        with ThreadPoolExecutor(max_workers=wave_size) as executor:
+            while len(outcomes) < max_attempts:
+                if outcomes:
+                    low, high = self._success_rate_interval(sum(1 for ok, _ in outcomes if ok), len(outcomes))
+                    if self._success_rate_decided(low, high):
+                        print(f"\n   ⏭️ Verdict reached after {len(outcomes)} attempts")
+                        break
+                first = len(outcomes) + 1
+                outcomes.extend(executor.map(
+                    lambda attempt_num: self.test_generate_pyq_solution_detailed(topic_id, attempt_num),
+                    range(first, min(first + wave_size, max_attempts + 1))
+                ))
+        
+        pyq_attempts = len(outcomes)
+        
+        for i, (success, data) in enumerate(outcomes):
+            log.debug("\n   PYQ Solution Attempt %d/%d:", i+1, pyq_attempts)
             
             if success:
                 pyq_successes += 1
-                print(f"   ✅ Attempt {i+1}: SUCCESS")
+                log.info("   ✅ Attempt %d: SUCCESS", i+1)
                 if data:
-                    print(f"      Answer: {data.get('answer', 'N/A')}")
-                    print(f"      Confidence: {data.get('confidence_level', 'N/A')}")
-                    print(f"      Solution length: {len(data.get('solution', ''))}")
+                    log.debug("      Answer: %s", data.get('answer', 'N/A'))
+                    log.debug("      Confidence: %s", data.get('confidence_level', 'N/A'))
+                    log.debug("      Solution length: %d", len(data.get('solution', '')))
             else:
-                # Check if it's a JSON parsing error
-                if 'json' in str(data).lower() or 'parsing' in str(data).lower():
+                # The detailed helpers tag every failure with its kind
+                if isinstance(data, dict) and data.get('error') == 'json_parsing':
                     pyq_json_errors += 1
-                    print(f"   ❌ Attempt {i+1}: JSON PARSING ERROR")
+                    log.info("   ❌ Attempt %d: JSON PARSING ERROR", i+1)
                 else:
                     pyq_other_errors += 1
-                    print(f"   ❌ Attempt {i+1}: OTHER ERROR")
-            
-            results['generate_pyq_solution_tests'].append({
-                'attempt': i+1,
-                'success': success,
-                'data': data
-            })
-        
-        pyq_success_rate = (pyq_successes / 6) * 100
+                    log.info("   ❌ Attempt %d: OTHER ERROR", i+1)
+        flush_log(log)
+        
+        pyq_success_rate = (pyq_successes / pyq_attempts) * 100
+        ci_low, ci_high = self._success_rate_interval(pyq_successes, pyq_attempts)
+        results['generate_pyq_solution_ci'] = (ci_low * 100, ci_high * 100)
+        results['generate_pyq_solution_counts'] = {
+            'attempts': pyq_attempts,
+            'successes': pyq_successes,
+            'json_errors': pyq_json_errors,
+            'other_errors': pyq_other_errors
+        }
         print(f"\n   📊 PYQ Solution Generation Results:")
-        print(f"      Success Rate: {pyq_success_rate:.1f}% ({pyq_successes}/6)")
-        print(f"      JSON Parsing Errors: {pyq_json_errors}/6")
-        print(f"      Other Errors: {pyq_other_errors}/6")
+        print(f"      Success Rate: {pyq_success_rate:.1f}% ({pyq_successes}/{pyq_attempts})")
+        print(f"      95% CI: {ci_low * 100:.1f}% - {ci_high * 100:.1f}%")
+        print(f"      JSON Parsing Errors: {pyq_json_errors}/{pyq_attempts}")
+        print(f"      Other Errors: {pyq_other_errors}/{pyq_attempts}")
         print(f"      Expected: ~33.3% success rate")
         print(f"      Status: {'✅ MATCHES EXPECTED' if 20 <= pyq_success_rate <= 50 else '⚠️ DIFFERENT FROM EXPECTED'}")
         
@@ -2014,13 +2199,19 @@ class QuestionMakerAPITester:
         print("   Purpose: Generate solutions for existing PYQ questions by ID")
         
         if existing_questions:
-            # Test with first few existing questions
-            for i, question in enumerate(existing_questions[:3]):
+            # Test with first few existing questions; each call is independent so fan them out
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {
+                    executor.submit(self.test_generate_pyq_solution_by_id_detailed, q.get('id'), i+1): q
+                    for i, q in enumerate(existing_questions[:3])
+                }
+                completed = [(futures[future], future.result()) for future in as_completed(futures)]
+            
+            for question, (success, data) in completed:
                 question_id = question.get('id')
-                print(f"\n   Testing with question ID: {question_id}")
-                print(f"   Question: {question.get('question_statement', '')[:80]}...")
+                log.info("\n   Testing with question ID: %s", question_id)
+                log.debug("   Question: %s...", question.get('question_statement', '')[:80])
                 
-                success, data = self.test_generate_pyq_solution_by_id_detailed(question_id, i+1)
                 results['generate_pyq_solution_by_id_tests'].append({
                     'question_id': question_id,
                     'success': success,
@@ -2028,12 +2219,13 @@ class QuestionMakerAPITester:
                 })
                 
                 if success:
-                    print(f"   ✅ Generated solution successfully")
+                    log.info("   ✅ Generated solution successfully")
                     if data:
-                        print(f"      Answer: {data.get('answer', 'N/A')}")
-                        print(f"      Confidence: {data.get('confidence_level', 'N/A')}")
+                        log.debug("      Answer: %s", data.get('answer', 'N/A'))
+                        log.debug("      Confidence: %s", data.get('confidence_level', 'N/A'))
                 else:
-                    print(f"   ❌ Failed to generate solution")
+                    log.info("   ❌ Failed to generate solution")
+            flush_log(log)
         else:
             print("   ⚠️ No existing questions found - skipping this test")
         
@@ -2074,11 +2266,11 @@ class QuestionMakerAPITester:
         print(f"\n5️⃣ Testing POST /api/generate-question")
         print("   Purpose: Generate new questions and verify saving to new_questions table")
         
-        question_types = ["MCQ", "MSQ", "NAT"]  # Avoid SUB due to database constraint
+        outcomes = [future.result() for future in generation_futures]
         
-        for q_type in question_types:
+        for q_type, (success, data) in zip(question_types, outcomes):
             print(f"\n   Testing {q_type} question generation...")
-            success, data = self.test_question_generation_detailed(topic_id, q_type)
+            print('\n'.join(generation_lines[q_type]))
             results['generate_question_tests'].append({
                 'question_type': q_type,
                 'success': success,
@@ -2115,35 +2307,46 @@ class QuestionMakerAPITester:
         return results
     
     def test_generate_pyq_solution_detailed(self, topic_id, attempt_num):
-        """Detailed test of PYQ solution generation with error analysis"""
-        request_data = {
-            "topic_id": topic_id,
-            "question_statement": f"Find the harmonic mean of 4, 6, and 12. (Attempt {attempt_num})",
-            "options": ["6", "6.4", "7.2", "8"],
-            "question_type": "MCQ"
-        }
+        """Detailed test of PYQ solution generation; returns (success, data).
+        
+        Failures are not retried: the suite measures the raw success rate, and retrying
+        would hide the very 500s and JSON errors it is looking for.
+        """
+        template = self._pyq_body_templates.get(topic_id)
+        if template is None:
+            template = self._pyq_body_templates[topic_id] = dumps_body({
+                "topic_id": topic_id,
+                "question_statement": "Find the harmonic mean of 4, 6, and 12. (Attempt {N})",
+                "options": ["6", "6.4", "7.2", "8"],
+                "question_type": "MCQ"
+            })
+        body = template.replace(b'{N}', str(attempt_num).encode())
         
         url = f"{self.api_url}/generate-pyq-solution"
-        headers = {'Content-Type': 'application/json'}
         
+        return self._post_pyq_solution(url, body, attempt_num)
+    
+    def _post_pyq_solution(self, url, body, attempt_num):
+        """Single generate-pyq-solution call, classified into (success, data)"""
         try:
-            response = requests.post(url, json=request_data, headers=headers, timeout=60)
+            response = self._timed('generate-pyq-solution', 'post', url, data=body, timeout=60, stream=True)
             
             if response.status_code == 200:
                 try:
-                    response_data = response.json()
+                    response_data = loads_body(response.content)
                     return True, response_data
                 except json.JSONDecodeError as e:
-                    print(f"      JSON Parsing Error: {str(e)}")
-                    print(f"      Raw Response: {response.text[:200]}...")
+                    log.warning("      [Attempt %d] JSON Parsing Error: %s", attempt_num, e)
+                    log.warning("      [Attempt %d] Raw Response: %s...", attempt_num, self._response_head(response))
                     return False, {'error': 'json_parsing', 'details': str(e)}
             else:
-                print(f"      HTTP Error: {response.status_code}")
-                print(f"      Response: {response.text[:200]}...")
-                return False, {'error': 'http_error', 'status': response.status_code}
+                error_text = self._response_head(response)
+                log.warning("      [Attempt %d] HTTP Error: %s", attempt_num, response.status_code)
+                log.warning("      [Attempt %d] Response: %s...", attempt_num, error_text)
+                return False, {'error': 'http_error', 'status': response.status_code, 'details': error_text}
                 
         except Exception as e:
-            print(f"      Exception: {str(e)}")
+            log.warning("      [Attempt %d] Exception: %s", attempt_num, e)
             return False, {'error': 'exception', 'details': str(e)}
     
     def test_generate_pyq_solution_by_id_detailed(self, question_id, attempt_num):
@@ -2153,22 +2356,22 @@ class QuestionMakerAPITester:
         }
         
         url = f"{self.api_url}/generate-pyq-solution-by-id"
-        headers = {'Content-Type': 'application/json'}
         
         try:
-            response = requests.post(url, json=request_data, headers=headers, timeout=60)
+            response = self._timed('generate-pyq-solution-by-id', 'post', url, data=dumps_body(request_data), timeout=60, stream=True)
             
             if response.status_code == 200:
                 try:
-                    response_data = response.json()
+                    response_data = loads_body(response.content)
                     return True, response_data
                 except json.JSONDecodeError as e:
                     print(f"      JSON Parsing Error: {str(e)}")
                     return False, {'error': 'json_parsing', 'details': str(e)}
             else:
+                error_text = self._response_head(response)
                 print(f"      HTTP Error: {response.status_code}")
-                print(f"      Response: {response.text[:200]}...")
-                return False, {'error': 'http_error', 'status': response.status_code}
+                print(f"      Response: {error_text}...")
+                return False, {'error': 'http_error', 'status': response.status_code, 'details': error_text}
                 
         except Exception as e:
             print(f"      Exception: {str(e)}")
@@ -2176,30 +2379,25 @@ class QuestionMakerAPITester:
     
     def test_update_question_solution_detailed(self, question_id):
         """Detailed test of question solution update"""
-        request_data = {
-            "question_id": question_id,
-            "answer": "1",
-            "solution": "To find the harmonic mean of numbers a, b, c: HM = 3/(1/a + 1/b + 1/c). For 4, 6, 12: HM = 3/(1/4 + 1/6 + 1/12) = 3/(3/12 + 2/12 + 1/12) = 3/(6/12) = 3/(1/2) = 6. The answer is option 1 (6).",
-            "confidence_level": "High"
-        }
+        body = dumps_body({"question_id": question_id, **UPDATE_SOLUTION_FIELDS})
         
         url = f"{self.api_url}/update-question-solution"
-        headers = {'Content-Type': 'application/json'}
         
         try:
-            response = requests.patch(url, json=request_data, headers=headers, timeout=30)
+            response = self._timed('update-question-solution', 'patch', url, data=body, timeout=30, stream=True)
             
             if response.status_code == 200:
                 try:
-                    response_data = response.json()
+                    response_data = loads_body(response.content)
                     return True, response_data
                 except json.JSONDecodeError as e:
                     print(f"      JSON Parsing Error: {str(e)}")
                     return False, {'error': 'json_parsing', 'details': str(e)}
             else:
+                error_text = self._response_head(response)
                 print(f"      HTTP Error: {response.status_code}")
-                print(f"      Response: {response.text[:200]}...")
-                return False, {'error': 'http_error', 'status': response.status_code}
+                print(f"      Response: {error_text}...")
+                return False, {'error': 'http_error', 'status': response.status_code, 'details': error_text}
                 
         except Exception as e:
             print(f"      Exception: {str(e)}")
@@ -2208,10 +2406,9 @@ class QuestionMakerAPITester:
     def test_generated_questions_endpoint(self, topic_id):
         """Test the generated questions endpoint to verify data saving"""
         url = f"{self.api_url}/generated-questions/{topic_id}"
-        headers = {'Content-Type': 'application/json'}
         
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._timed('generated-questions', 'get', url, timeout=30)
             
             if response.status_code == 200:
                 try:
@@ -2244,17 +2441,19 @@ class QuestionMakerAPITester:
         print(f"   Purpose: Retrieve PYQ questions from questions_topic_wise table")
         
         # 2. PYQ Solution Generation Analysis
-        pyq_tests = results.get('generate_pyq_solution_tests', [])
-        pyq_successes = sum(1 for test in pyq_tests if test['success'])
-        pyq_total = len(pyq_tests)
+        # Counted by the test loop as it classified each attempt
+        pyq_counts = results.get('generate_pyq_solution_counts', {})
+        pyq_successes = pyq_counts.get('successes', 0)
+        pyq_total = pyq_counts.get('attempts', 0)
         pyq_success_rate = (pyq_successes / pyq_total * 100) if pyq_total > 0 else 0
         
-        json_errors = sum(1 for test in pyq_tests if not test['success'] and 
-                         isinstance(test.get('data'), dict) and 
-                         test['data'].get('error') == 'json_parsing')
+        json_errors = pyq_counts.get('json_errors', 0)
         
         print(f"\n2️⃣ POST /api/generate-pyq-solution")
         print(f"   Success Rate: {pyq_success_rate:.1f}% ({pyq_successes}/{pyq_total})")
+        if 'generate_pyq_solution_ci' in results:
+            ci_low, ci_high = results['generate_pyq_solution_ci']
+            print(f"   95% CI: {ci_low:.1f}% - {ci_high:.1f}%")
         print(f"   JSON Parsing Errors: {json_errors}/{pyq_total}")
         print(f"   Expected Issue: ~33.3% success rate with JSON parsing errors")
         print(f"   Status: {'✅ ISSUE CONFIRMED' if 20 <= pyq_success_rate <= 50 and json_errors > 0 else '⚠️ DIFFERENT BEHAVIOR'}")
@@ -2352,6 +2551,16 @@ class QuestionMakerAPITester:
             print(f"   - Impact: Unreliable PYQ solution generation")
             print(f"   - Recommendation: Implement retry logic and better error handling")
         
+        # Latency per endpoint
+        latency_ms = {}
+        if self.timings:
+            print(f"\n⏱️ ENDPOINT LATENCY")
+            print("=" * 40)
+            for endpoint, samples in sorted(self.timings.items()):
+                p50, p95 = self._latency_percentiles(samples)
+                latency_ms[endpoint] = {'p50': p50, 'p95': p95, 'count': len(samples)}
+                print(f"   {endpoint}: p50 {p50:.0f}ms, p95 {p95:.0f}ms ({len(samples)} calls)")
+        
         # Success Criteria Check
         system_health = len(working_components) / (len(working_components) + len(critical_issues)) * 100 if (len(working_components) + len(critical_issues)) > 0 else 0
         
@@ -2372,19 +2581,31 @@ class QuestionMakerAPITester:
             'data_saving_working': saving_success,
             'critical_issues': critical_issues,
             'working_components': working_components,
-            'system_health': system_health
+            'system_health': system_health,
+            'latency_ms': latency_ms
         }
 
 def main():
+    if '--verbose' in sys.argv:
+        log.setLevel(logging.DEBUG)
+    
+    # One tester (and so one connection pool) is shared by every phase and closed at the end
+    with QuestionMakerAPITester() as tester:
+        return run_pyq_suite(tester)
+
+def run_pyq_suite(tester):
     print("🚀 Testing PYQ Solution Generation System")
     print("🎯 Focus: Review Request - Comprehensive PYQ solution testing")
     print("=" * 80)
     
-    tester = QuestionMakerAPITester()
-    
     # Test basic connectivity first
     print("\n1️⃣ Testing Basic API Connectivity...")
-    tester.test_root_endpoint()
+    root_ok, _ = tester.test_root_endpoint()
+    if not root_ok:
+        print("❌ Backend unreachable; aborting")
+        return 3
+    # The first PYQ phase opens four requests at once; have their connections ready
+    tester.warm_up(connections=4)
     
     # Run comprehensive PYQ solution generation testing as requested
     print("\n2️⃣ Running Comprehensive PYQ Solution Generation Testing...")
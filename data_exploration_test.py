@@ -1,90 +1,78 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 
+from http_helpers import loads_body
+
+# One keep-alive pool for the whole walk instead of a fresh connection per request
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32,
+                                      max_retries=Retry(total=3, backoff_factor=0.3)))
+session.headers.update({'Content-Type': 'application/json'})
+
+def iter_candidate_topics(base_url):
+    """Lazily yield the first topic of each course; nothing past the caller's stopping point is fetched"""
+    exams_response = session.get(f"{base_url}/exams")
+    exams = loads_body(exams_response.content)
+    print(f"\n📚 Found {len(exams)} exams:")
+    
+    for exam in exams:
+        print(f"  - {exam['name']} (ID: {exam['id']})")
+        
+        courses_response = session.get(f"{base_url}/courses/{exam['id']}")
+        courses = loads_body(courses_response.content)
+        print(f"    Courses: {len(courses)}")
+        
+        for course in courses:
+            print(f"      - {course['name']} (ID: {course['id']})")
+            
+            # Every topic of the course with its chapter/unit/subject names, in one request
+            topics_response = session.get(f"{base_url}/all-topics-with-weightage/{course['id']}")
+            topics = loads_body(topics_response.content) if topics_response.status_code == 200 else []
+            subject_names = {topic['subject_id']: topic['subject_name'] for topic in topics}
+            print(f"        Subjects with topics: {len(subject_names)}, Topics: {len(topics)}")
+            
+            if topics:
+                topic = topics[0]
+                print(f"          - {topic['subject_name']} -> {topic['unit_name']} -> {topic['chapter_name']}")
+                print(f"            - {topic['name']} (ID: {topic['id']})")
+                yield topic['id']
+            
+            print()  # Empty line between courses
+
+def try_generate(base_url, topic_id):
+    """Generate one MCQ for topic_id and report whether it worked"""
+    print(f"              Testing question generation...")
+    question_data = {
+        "topic_id": topic_id,
+        "question_type": "MCQ"
+    }
+    
+    try:
+        gen_response = session.post(f"{base_url}/generate-question", json=question_data, timeout=30)
+        if gen_response.status_code == 200:
+            print(f"              ✅ Question generation works!")
+            return True
+        else:
+            print(f"              ❌ Question generation failed: {gen_response.status_code}")
+    except Exception as e:
+        print(f"              ❌ Question generation error: {str(e)}")
+    return False
+
 def explore_all_data():
+    """Explore the data course by course until one topic generates a question"""
     base_url = "https://testsmith-1.preview.emergentagent.com/api"
     
     print("🔍 Exploring all available data...")
     
-    # Get all exams
     try:
-        exams_response = requests.get(f"{base_url}/exams")
-        exams = exams_response.json()
-        print(f"\n📚 Found {len(exams)} exams:")
-        
-        for exam in exams:
-            print(f"  - {exam['name']} (ID: {exam['id']})")
-            
-            # Get courses for each exam
-            courses_response = requests.get(f"{base_url}/courses/{exam['id']}")
-            courses = courses_response.json()
-            print(f"    Courses: {len(courses)}")
-            
-            for course in courses:
-                print(f"      - {course['name']} (ID: {course['id']})")
-                
-                # Get subjects for each course
-                subjects_response = requests.get(f"{base_url}/subjects/{course['id']}")
-                subjects = subjects_response.json()
-                print(f"        Subjects: {len(subjects)}")
-                
-                if subjects:
-                    for subject in subjects[:2]:  # Show first 2 subjects
-                        print(f"          - {subject['name']} (ID: {subject['id']})")
-                        
-                        # Get units for first subject
-                        units_response = requests.get(f"{base_url}/units/{subject['id']}")
-                        units = units_response.json()
-                        print(f"            Units: {len(units)}")
-                        
-                        if units:
-                            unit = units[0]
-                            print(f"              - {unit['name']} (ID: {unit['id']})")
-                            
-                            # Get chapters
-                            chapters_response = requests.get(f"{base_url}/chapters/{unit['id']}")
-                            chapters = chapters_response.json()
-                            print(f"                Chapters: {len(chapters)}")
-                            
-                            if chapters:
-                                chapter = chapters[0]
-                                print(f"                  - {chapter['name']} (ID: {chapter['id']})")
-                                
-                                # Get topics
-                                topics_response = requests.get(f"{base_url}/topics/{chapter['id']}")
-                                topics = topics_response.json()
-                                print(f"                    Topics: {len(topics)}")
-                                
-                                if topics:
-                                    topic = topics[0]
-                                    print(f"                      - {topic['name']} (ID: {topic['id']})")
-                                    
-                                    # Test question generation
-                                    print(f"                        Testing question generation...")
-                                    question_data = {
-                                        "topic_id": topic['id'],
-                                        "question_type": "MCQ"
-                                    }
-                                    
-                                    try:
-                                        gen_response = requests.post(f"{base_url}/generate-question", json=question_data, timeout=30)
-                                        if gen_response.status_code == 200:
-                                            print(f"                        ✅ Question generation works!")
-                                            return True
-                                        else:
-                                            print(f"                        ❌ Question generation failed: {gen_response.status_code}")
-                                    except Exception as e:
-                                        print(f"                        ❌ Question generation error: {str(e)}")
-                                    
-                                    return False  # Found data structure, can test frontend
-                
-                print()  # Empty line between courses
-                
+        # Stops fetching as soon as a topic works
+        return any(try_generate(base_url, topic_id) for topic_id in iter_candidate_topics(base_url))
     except Exception as e:
         print(f"❌ Error exploring data: {str(e)}")
         return False
-    
-    return False
 
 if __name__ == "__main__":
-    explore_all_data()
\ No newline at end of file
+    with session:
+        explore_all_data()
\ No newline at end of file
@@ -1,26 +1,62 @@
-import requests
+import httpx
 import json
+import sys
+from collections import defaultdict
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from http_helpers import head, loads_body, buffered_logger, flush_log
+
+# Per-node listing lines are buffered and written in blocks instead of one print per line
+log = buffered_logger('investigation')
 
 class DataInvestigationTester:
     def __init__(self, base_url="https://testsmith-1.preview.emergentagent.com"):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
         
+        # The concurrent level fetches multiplex over one HTTP/2 connection under the API prefix
+        self.client = httpx.Client(
+            base_url=self.api_url,
+            transport=httpx.HTTPTransport(http2=True, retries=3,
+                                          limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)),
+            headers={'Content-Type': 'application/json'},
+            timeout=30
+        )
+        
+        # Reference data does not change during a run: {endpoint: data}, successful responses only
+        self._cache = {}
+        
+    def close(self):
+        """Release the pooled connections"""
+        self.client.close()
+
+    def clear_cache(self):
+        """Forget memoized responses so the next run re-fetches everything"""
+        self._cache.clear()
+
     def get_data(self, endpoint):
-        """Get data from an endpoint"""
-        url = f"{self.api_url}/{endpoint}"
+        """Get data from an endpoint, memoized per endpoint"""
+        if endpoint in self._cache:
+            return self._cache[endpoint]
         try:
-            response = requests.get(url, timeout=30)
+            response = self.client.get(endpoint, timeout=30)
             if response.status_code == 200:
-                return response.json()
+                data = loads_body(response.content)
+                self._cache[endpoint] = data
+                return data
             else:
-                print(f"❌ Error {response.status_code} for {endpoint}: {response.text}")
+                log.warning("❌ Error %s for %s: %s", response.status_code, endpoint, response.text)
                 return []
         except Exception as e:
-            print(f"❌ Exception for {endpoint}: {str(e)}")
+            log.warning("❌ Exception for %s: %s", endpoint, e)
             return []
 
+    def get_many(self, endpoints, max_workers=10):
+        """Fetch sibling endpoints concurrently, returning results in the same order"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.get_data, endpoints))
+
     def investigate_database_structure(self):
         """Investigate the complete database structure"""
         print("🔍 INVESTIGATING DATABASE STRUCTURE")
@@ -28,72 +64,140 @@ class DataInvestigationTester:
         
         # Get all exams
         exams = self.get_data("exams")
-        print(f"\n📊 EXAMS: {len(exams)} found")
+        log.info("\n📊 EXAMS: %s found", len(exams))
         for exam in exams:
-            print(f"  - {exam['name']} ({exam['id']})")
+            log.info("  - %s (%s)", exam['name'], exam['id'])
         
+        # Each level is fetched as one concurrent wave, so the walk costs one round trip per depth
         # For each exam, get courses
         exam_course_map = {}
-        for exam in exams:
+        all_courses = []
+        level = self.get_many([f"courses/{exam['id']}" for exam in exams])
+        for exam, courses in zip(exams, level):
             exam_id = exam['id']
-            courses = self.get_data(f"courses/{exam_id}")
             exam_course_map[exam_id] = courses
-            print(f"\n📊 COURSES for {exam['name']}: {len(courses)} found")
+            log.info("\n📊 COURSES for %s: %s found", exam['name'], len(courses))
             for course in courses:
-                print(f"  - {course['name']} ({course['id']})")
+                log.info("  - %s (%s)", course['name'], course['id'])
+                all_courses.append(course)
         
         # For each course, get subjects
         course_subject_map = {}
-        for exam_id, courses in exam_course_map.items():
-            for course in courses:
-                course_id = course['id']
-                subjects = self.get_data(f"subjects/{course_id}")
-                course_subject_map[course_id] = subjects
-                print(f"\n📊 SUBJECTS for {course['name']}: {len(subjects)} found")
-                for subject in subjects:
-                    print(f"  - {subject['name']} ({subject['id']})")
+        all_subjects = []
+        level = self.get_many([f"subjects/{course['id']}" for course in all_courses])
+        for course, subjects in zip(all_courses, level):
+            course_id = course['id']
+            course_subject_map[course_id] = subjects
+            log.info("\n📊 SUBJECTS for %s: %s found", course['name'], len(subjects))
+            for subject in subjects:
+                log.info("  - %s (%s)", subject['name'], subject['id'])
+                all_subjects.append(subject)
         
         # For each subject, get units
         subject_unit_map = {}
-        for course_id, subjects in course_subject_map.items():
-            for subject in subjects:
-                subject_id = subject['id']
-                units = self.get_data(f"units/{subject_id}")
-                subject_unit_map[subject_id] = units
-                print(f"\n📊 UNITS for {subject['name']}: {len(units)} found")
-                for unit in units:
-                    print(f"  - {unit['name']} ({unit['id']})")
+        all_units = []
+        unit_name_by_id = {}
+        level = self.get_many([f"units/{subject['id']}" for subject in all_subjects])
+        for subject, units in zip(all_subjects, level):
+            subject_id = subject['id']
+            subject_unit_map[subject_id] = units
+            log.info("\n📊 UNITS for %s: %s found", subject['name'], len(units))
+            for unit in units:
+                log.info("  - %s (%s)", unit['name'], unit['id'])
+                all_units.append(unit)
+                unit_name_by_id[unit['id']] = unit['name']
         
         # For each unit, get chapters
         unit_chapter_map = {}
-        for subject_id, units in subject_unit_map.items():
-            for unit in units:
-                unit_id = unit['id']
-                chapters = self.get_data(f"chapters/{unit_id}")
-                unit_chapter_map[unit_id] = chapters
-                print(f"\n📊 CHAPTERS for {unit['name']}: {len(chapters)} found")
-                for chapter in chapters:
-                    print(f"  - {chapter['name']} ({chapter['id']})")
-        
-        # For each chapter, get topics
+        all_chapters = []
+        level = self.get_many([f"chapters/{unit['id']}" for unit in all_units])
+        for unit, chapters in zip(all_units, level):
+            unit_id = unit['id']
+            unit_chapter_map[unit_id] = chapters
+            log.info("\n📊 CHAPTERS for %s: %s found", unit['name'], len(chapters))
+            for chapter in chapters:
+                log.info("  - %s (%s)", chapter['name'], chapter['id'])
+                all_chapters.append((unit_id, chapter))
+        
+        # For each chapter, get topics; complete paths are recorded in the same pass
         chapter_topic_map = {}
         complete_paths = []
-        for unit_id, chapters in unit_chapter_map.items():
-            for chapter in chapters:
-                chapter_id = chapter['id']
-                topics = self.get_data(f"topics/{chapter_id}")
-                chapter_topic_map[chapter_id] = topics
-                print(f"\n📊 TOPICS for {chapter['name']}: {len(topics)} found")
-                for topic in topics:
-                    print(f"  - {topic['name']} ({topic['id']})")
-                    # This is a complete path
-                    complete_paths.append({
-                        'topic_id': topic['id'],
-                        'topic_name': topic['name'],
-                        'chapter_name': chapter['name'],
-                        'unit_name': [u['name'] for u in subject_unit_map.values() for u in u if u['id'] == unit_id][0] if unit_id in [u['id'] for units in subject_unit_map.values() for u in units] else 'Unknown',
-                        'path': f"Topic: {topic['name']} -> Chapter: {chapter['name']}"
-                    })
+        level = self.get_many([f"topics/{chapter['id']}" for _, chapter in all_chapters])
+        for (unit_id, chapter), topics in zip(all_chapters, level):
+            chapter_id = chapter['id']
+            chapter_topic_map[chapter_id] = topics
+            log.info("\n📊 TOPICS for %s: %s found", chapter['name'], len(topics))
+            for topic in topics:
+                log.info("  - %s (%s)", topic['name'], topic['id'])
+                # This is a complete path
+                complete_paths.append({
+                    'topic_id': topic['id'],
+                    'topic_name': topic['name'],
+                    'chapter_name': chapter['name'],
+                    'unit_name': unit_name_by_id.get(unit_id, 'Unknown'),
+                    'path': f"Topic: {topic['name']} -> Chapter: {chapter['name']}"
+                })
+        
+        flush_log(log)
+        print(f"\n✅ COMPLETE PATHS FOUND: {len(complete_paths)}")
+        for i, path in enumerate(complete_paths[:5]):  # Show first 5
+            print(f"  {i+1}. {path['path']}")
+        
+        return complete_paths
+
+    def investigate_via_batch(self):
+        """Investigate the database structure with one all-topics-with-weightage call per course"""
+        print("🔍 INVESTIGATING DATABASE STRUCTURE (batched)")
+        print("=" * 60)
+        
+        exams = self.get_data("exams")
+        log.info("\n📊 EXAMS: %s found", len(exams))
+        for exam in exams:
+            log.info("  - %s (%s)", exam['name'], exam['id'])
+        
+        exam_course_map = {}
+        level = self.get_many([f"courses/{exam['id']}" for exam in exams])
+        for exam, courses in zip(exams, level):
+            exam_course_map[exam['id']] = courses
+            log.info("\n📊 COURSES for %s: %s found", exam['name'], len(courses))
+            for course in courses:
+                log.info("  - %s (%s)", course['name'], course['id'])
+        
+        # Each row carries its chapter/unit/subject ids and names, so the maps are rebuilt
+        # in-process. Subjects, units and chapters without topics do not appear in this view.
+        course_subject_map = defaultdict(list)
+        subject_unit_map = defaultdict(list)
+        unit_chapter_map = defaultdict(list)
+        chapter_topic_map = defaultdict(list)
+        complete_paths = []
+        seen = set()
+        all_courses = [course for courses in exam_course_map.values() for course in courses]
+        level = self.get_many([f"all-topics-with-weightage/{course['id']}" for course in all_courses])
+        for course, topics in zip(all_courses, level):
+            log.info("\n📊 TOPICS for %s: %s found", course['name'], len(topics))
+            for topic in topics:
+                for parent_map, parent_id, child_id, child_name in [
+                    (course_subject_map, course['id'], topic['subject_id'], topic['subject_name']),
+                    (subject_unit_map, topic['subject_id'], topic['unit_id'], topic['unit_name']),
+                    (unit_chapter_map, topic['unit_id'], topic['chapter_id'], topic['chapter_name']),
+                ]:
+                    if (parent_id, child_id) not in seen:
+                        seen.add((parent_id, child_id))
+                        parent_map[parent_id].append({'id': child_id, 'name': child_name})
+                chapter_topic_map[topic['chapter_id']].append(topic)
+                log.info("  - %s (%s)", topic['name'], topic['id'])
+                complete_paths.append({
+                    'topic_id': topic['id'],
+                    'topic_name': topic['name'],
+                    'chapter_name': topic['chapter_name'],
+                    'unit_name': topic['unit_name'],
+                    'path': f"Topic: {topic['name']} -> Chapter: {topic['chapter_name']}"
+                })
+        
+        flush_log(log)
+        print(f"\n📊 SUBJECTS: {sum(map(len, course_subject_map.values()))}, "
+              f"UNITS: {sum(map(len, subject_unit_map.values()))}, "
+              f"CHAPTERS: {sum(map(len, unit_chapter_map.values()))}")
         
         print(f"\n✅ COMPLETE PATHS FOUND: {len(complete_paths)}")
         for i, path in enumerate(complete_paths[:5]):  # Show first 5
@@ -101,9 +205,13 @@ class DataInvestigationTester:
         
         return complete_paths
 
-    def test_question_generation_detailed(self, topic_id, question_type):
-        """Test question generation with detailed error reporting"""
-        print(f"\n🔍 Testing {question_type} generation for topic {topic_id}")
+    def test_question_generation_detailed(self, topic_id, question_type, out=print):
+        """Test question generation with detailed error reporting.
+        
+        Output goes through `out`; pass a list's append to collect it when several
+        types run at once.
+        """
+        out(f"\n🔍 Testing {question_type} generation for topic {topic_id}")
         
         request_data = {
             "topic_id": topic_id,
@@ -112,28 +220,29 @@ class DataInvestigationTester:
             "slot_id": None
         }
         
-        url = f"{self.api_url}/generate-question"
         try:
-            response = requests.post(url, json=request_data, timeout=60)
-            print(f"Status Code: {response.status_code}")
-            print(f"Response Headers: {dict(response.headers)}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✅ SUCCESS: Generated {question_type} question")
-                print(f"Question: {data.get('question_statement', '')[:100]}...")
-                return True
-            else:
-                print(f"❌ FAILED: {response.status_code}")
-                try:
-                    error_data = response.json()
-                    print(f"Error Detail: {error_data.get('detail', 'No detail')}")
-                except:
-                    print(f"Raw Response: {response.text[:500]}")
-                return False
+            with self.client.stream("POST", "generate-question", json=request_data, timeout=60) as response:
+                out(f"Status Code: {response.status_code}")
+                out(f"Response Headers: {dict(response.headers)}")
+                
+                if response.status_code == 200:
+                    data = loads_body(response.read())
+                    out(f"✅ SUCCESS: Generated {question_type} question")
+                    out(f"Question: {data.get('question_statement', '')[:100]}...")
+                    return True
+                else:
+                    out(f"❌ FAILED: {response.status_code}")
+                    # Error bodies are small JSON; cap the read in case an upstream HTML page comes back
+                    error_text = head(response, 4096)
+                    try:
+                        error_data = json.loads(error_text)
+                        out(f"Error Detail: {error_data.get('detail', 'No detail')}")
+                    except:
+                        out(f"Raw Response: {error_text[:500]}")
+                    return False
                 
         except Exception as e:
-            print(f"❌ EXCEPTION: {str(e)}")
+            out(f"❌ EXCEPTION: {str(e)}")
             return False
 
 def main():
@@ -142,8 +251,11 @@ def main():
     
     tester = DataInvestigationTester()
     
-    # Investigate database structure
-    complete_paths = tester.investigate_database_structure()
+    # Investigate database structure; --legacy walks the per-level endpoints for comparison
+    if '--legacy' in sys.argv:
+        complete_paths = tester.investigate_database_structure()
+    else:
+        complete_paths = tester.investigate_via_batch()
     
     if complete_paths:
         print(f"\n🎯 Testing question generation with first complete path...")
@@ -151,11 +263,16 @@ def main():
         
         # Test all question types
         question_types = ["MCQ", "MSQ", "NAT", "SUB"]
-        success_count = 0
         
+        # The four types are independent generate calls, so run them side by side;
+        # each one's lines are collected and printed together once all have finished
+        lines = {q_type: [] for q_type in question_types}
+        with ThreadPoolExecutor(max_workers=len(question_types)) as executor:
+            outcomes = list(executor.map(lambda q_type: tester.test_question_generation_detailed(topic_id, q_type, lines[q_type].append),
+                                         question_types))
         for q_type in question_types:
-            if tester.test_question_generation_detailed(topic_id, q_type):
-                success_count += 1
+            print('\n'.join(lines[q_type]))
+        success_count = sum(outcomes)
         
         print(f"\n📊 QUESTION GENERATION RESULTS: {success_count}/{len(question_types)} successful")
     else:
@@ -163,6 +280,7 @@ def main():
     
     print("\n" + "=" * 60)
     print("🏁 Investigation Complete")
+    tester.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,17 +1,121 @@
-import requests
+import httpx
 import json
+import sys
 import time
+import threading
 from datetime import datetime
+from collections import deque, defaultdict
+import statistics
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from http_helpers import dumps_body, loads_body, head, buffered_logger, flush_log
+
+try:
+    import numpy as np
+except ImportError:  # optional; percentiles fall back to the statistics module
+    np = None
+
+def latency_percentiles(samples, percents=(50, 95, 99)):
+    """Return the requested percentiles of a sequence of latencies"""
+    if np is not None:
+        return [float(p) for p in np.percentile(samples, percents)]
+    if len(samples) < 2:
+        return [samples[0]] * len(percents)
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return [cuts[p - 1] if p < 100 else max(samples) for p in percents]
+
+# Per-request lines are buffered off the request threads and written in blocks
+log = buffered_logger('roundrobin')
+
+class RateLimiter:
+    """Allow at most `rate` acquisitions in any one-second window; waits only when that is used up"""
+    def __init__(self, rate):
+        if not isinstance(rate, int) or rate < 1:
+            raise ValueError(f"rate must be a whole number of requests per second, at least 1 (got {rate!r})")
+        self.rate = rate
+        self.calls = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and now - self.calls[0] >= 1.0:
+                    self.calls.popleft()
+                if len(self.calls) < self.rate:
+                    self.calls.append(now)
+                    return
+                wait = 1.0 - (now - self.calls[0])
+            time.sleep(wait)
 
 class GeminiRoundRobinTester:
-    def __init__(self, base_url="https://testsmith-1.preview.emergentagent.com"):
+    def __init__(self, base_url="https://testsmith-1.preview.emergentagent.com", rps=5):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
+        
+        # Concurrent generate calls share one HTTP/2 connection; spare slots cover an HTTP/1.1 fallback
+        self.client = httpx.Client(
+            base_url=self.api_url,
+            transport=httpx.HTTPTransport(http2=True, retries=3,
+                                          limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)),
+            headers={'Content-Type': 'application/json'},
+            timeout=30
+        )
         self.topic_id = "7c583ed3-64bf-4fa0-bf20-058ac4b40737"  # Known working topic
+        self.limiter = RateLimiter(rps)
+        
+        # Encoded generate-question bodies per question type; only the type varies
+        self._bodies = {}
         self.tests_run = 0
         self.tests_passed = 0
         self.failed_tests = []
 
+    def close(self):
+        """Release the pooled connections"""
+        self.client.close()
+
+    def question_body(self, question_type):
+        """The generate-question body for question_type, encoded once and reused"""
+        body = self._bodies.get(question_type)
+        if body is None:
+            body = self._bodies[question_type] = dumps_body({
+                "topic_id": self.topic_id,
+                "question_type": question_type,
+                "part_id": None,
+                "slot_id": None
+            })
+        return body
+
+    def generate_once(self, question_type):
+        """Issue one generate-question call; returns (success, response_time or None)"""
+        body = self.question_body(question_type)
+        
+        start_time = time.time()
+        
+        try:
+            # Streamed so an error page is not downloaded past the part that gets logged
+            with self.client.stream(
+                "POST",
+                "generate-question",
+                content=body,
+                timeout=60
+            ) as response:
+                if response.status_code == 200:
+                    data = loads_body(response.read())
+                    response_time = time.time() - start_time
+                    log.info("    ✅ %s Success (%.2fs) - Question: %s...", question_type, response_time, data.get('question_statement', '')[:50])
+                    return True, response_time
+                else:
+                    error_text = head(response, 200)
+                    response_time = time.time() - start_time
+                    log.info("    ❌ %s Failed (%.2fs) - Status: %s", question_type, response_time, response.status_code)
+                    log.info("    Response: %s...", error_text)
+                    return False, response_time
+                
+        except Exception as e:
+            log.info("    ❌ %s Error: %s", question_type, e)
+            return False, None
+
     def test_question_generation_multiple_times(self, question_type, num_requests=5):
         """Test question generation multiple times to verify round-robin behavior"""
         print(f"\n🔄 Testing {question_type} question generation {num_requests} times...")
@@ -21,47 +125,21 @@ class GeminiRoundRobinTester:
         response_times = []
         
         for i in range(num_requests):
-            print(f"  Request {i+1}/{num_requests}...")
-            
-            request_data = {
-                "topic_id": self.topic_id,
-                "question_type": question_type,
-                "part_id": None,
-                "slot_id": None
-            }
+            # Paced by the shared limiter rather than a fixed sleep after every call
+            self.limiter.acquire()
+            log.info("  Request %s/%s...", i+1, num_requests)
             
-            start_time = time.time()
-            
-            try:
-                response = requests.post(
-                    f"{self.api_url}/generate-question",
-                    json=request_data,
-                    headers={'Content-Type': 'application/json'},
-                    timeout=60
-                )
-                
-                end_time = time.time()
-                response_time = end_time - start_time
+            success, response_time = self.generate_once(question_type)
+            if response_time is not None:
                 response_times.append(response_time)
-                
-                if response.status_code == 200:
-                    successful_requests += 1
-                    data = response.json()
-                    print(f"    ✅ Success ({response_time:.2f}s) - Question: {data.get('question_statement', '')[:50]}...")
-                else:
-                    failed_requests += 1
-                    print(f"    ❌ Failed ({response_time:.2f}s) - Status: {response.status_code}")
-                    print(f"    Response: {response.text[:200]}...")
-                    
-            except Exception as e:
+            if success:
+                successful_requests += 1
+            else:
                 failed_requests += 1
-                print(f"    ❌ Error: {str(e)}")
-            
-            # Small delay between requests
-            time.sleep(1)
         
         avg_response_time = sum(response_times) / len(response_times) if response_times else 0
         
+        flush_log(log)
         print(f"\n📊 {question_type} Results:")
         print(f"  Successful: {successful_requests}/{num_requests}")
         print(f"  Failed: {failed_requests}/{num_requests}")
@@ -70,23 +148,39 @@ class GeminiRoundRobinTester:
         
         return successful_requests, failed_requests, avg_response_time
 
-    def test_all_question_types(self):
-        """Test all question types with multiple requests"""
+    def test_all_question_types(self, num_requests=3):
+        """Test all question types with multiple requests, all in flight at once"""
         print("🚀 Starting Gemini Round-Robin API Key Testing...")
         print("=" * 70)
         
         question_types = ["MCQ", "MSQ", "NAT", "SUB"]
-        results = {}
+        jobs = [q_type for q_type in question_types for _ in range(num_requests)]
         
+        # Concurrent so the server's key rotation is exercised the way parallel users hit it
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            outcomes = list(executor.map(self.generate_once, jobs))
+        
+        results = {}
         for q_type in question_types:
-            successful, failed, avg_time = self.test_question_generation_multiple_times(q_type, 3)
+            mine = [outcome for job, outcome in zip(jobs, outcomes) if job == q_type]
+            # Preallocated; only the first `filled` slots hold samples
+            times = np.empty(len(mine)) if np is not None else [0.0] * len(mine)
+            filled = 0
+            for _, response_time in mine:
+                if response_time is not None:
+                    times[filled] = response_time
+                    filled += 1
+            samples = times[:filled]
+            successful = sum(1 for success, _ in mine if success)
             results[q_type] = {
                 'successful': successful,
-                'failed': failed,
-                'avg_time': avg_time
+                'failed': len(mine) - successful,
+                'avg_time': float(sum(samples)) / filled if filled else 0,
+                'percentiles': latency_percentiles(samples) if filled else None
             }
         
         # Summary
+        flush_log(log)
         print("\n" + "=" * 70)
         print("📊 GEMINI ROUND-ROBIN TEST SUMMARY")
         print("=" * 70)
@@ -101,70 +195,116 @@ class GeminiRoundRobinTester:
             total = result['successful'] + result['failed']
             success_rate = (result['successful']/total)*100 if total > 0 else 0
             print(f"{q_type:4}: {result['successful']}/{total} ({success_rate:.1f}%) - Avg: {result['avg_time']:.2f}s")
+            if result['percentiles']:
+                p50, p95, p99 = result['percentiles']
+                print(f"      p50/p95/p99: {p50:.2f}s / {p95:.2f}s / {p99:.2f}s")
         
         return results
 
-    def test_rapid_fire_requests(self, num_requests=10):
-        """Test rapid-fire requests to stress test the round-robin system"""
-        print(f"\n🔥 Rapid-fire test with {num_requests} concurrent-style requests...")
+    def test_rapid_fire_requests(self, num_requests=10, dedupe=False):
+        """Test rapid-fire requests to stress test the round-robin system.
+        
+        With dedupe=True, identical requests that are still in flight share one
+        server call (single-flight); use it as a comparison run, not a load test.
+        """
+        print(f"\n🔥 Rapid-fire test with {num_requests} concurrent requests{' (deduplicated)' if dedupe else ''}...")
         
-        request_data = {
-            "topic_id": self.topic_id,
-            "question_type": "NAT",  # Use NAT as it seems most reliable
-            "part_id": None,
-            "slot_id": None
-        }
+        body = self.question_body("NAT")  # Use NAT as it seems most reliable
+        
+        def timed_post():
+            start = time.perf_counter()
+            try:
+                return self.client.post("generate-question", content=body, timeout=30)
+            finally:
+                latencies.append(time.perf_counter() - start)
         
         successful = 0
         failed = 0
+        latencies = []
         start_time = time.time()
         
-        for i in range(num_requests):
-            try:
-                response = requests.post(
-                    f"{self.api_url}/generate-question",
-                    json=request_data,
-                    headers={'Content-Type': 'application/json'},
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    successful += 1
-                    print(f"  Request {i+1}: ✅")
-                else:
-                    failed += 1
-                    print(f"  Request {i+1}: ❌ Status {response.status_code}")
-                    
-            except Exception as e:
-                failed += 1
-                print(f"  Request {i+1}: ❌ Error: {str(e)}")
+        # All requests in flight at once, sharing the client's connection
+        key = body
+        inflight = {}
+        with ThreadPoolExecutor(max_workers=min(num_requests, 16)) as executor:
+            # future -> indices of the requests it answers
+            futures = defaultdict(list)
+            for i in range(num_requests):
+                future = inflight.get(key) if dedupe else None
+                if future is None or future.done():
+                    future = executor.submit(timed_post)
+                    inflight[key] = future
+                futures[future].append(i)
+            
+            for future in as_completed(futures):
+                for i in futures[future]:
+                    try:
+                        response = future.result()
+                        
+                        if response.status_code == 200:
+                            successful += 1
+                            log.info("  Request %s: ✅", i+1)
+                        else:
+                            failed += 1
+                            log.info("  Request %s: ❌ Status %s", i+1, response.status_code)
+                            
+                    except Exception as e:
+                        failed += 1
+                        log.info("  Request %s: ❌ Error: %s", i+1, e)
         
         total_time = time.time() - start_time
         
+        flush_log(log)
         print(f"\n📊 Rapid-fire Results:")
         print(f"  Total Time: {total_time:.2f}s")
+        print(f"  Server Calls: {len(futures)}")
         print(f"  Successful: {successful}/{num_requests}")
         print(f"  Failed: {failed}/{num_requests}")
         print(f"  Success Rate: {(successful/num_requests)*100:.1f}%")
         print(f"  Requests/second: {num_requests/total_time:.2f}")
+        if latencies:
+            p50, p95 = latency_percentiles(latencies, (50, 95))
+            print(f"  Latency p50/p95: {p50:.2f}s / {p95:.2f}s")
         
         return successful, failed
 
+def parse_rps(argv, default=5):
+    """Read --rps N from argv; N must be a whole number of requests per second, at least 1"""
+    if '--rps' not in argv:
+        return default
+    try:
+        rps = int(argv[argv.index('--rps') + 1])
+    except (IndexError, ValueError):
+        rps = 0
+    if rps < 1:
+        sys.exit("--rps needs a whole number of requests per second, at least 1")
+    return rps
+
 def main():
-    tester = GeminiRoundRobinTester()
+    # --rps N caps the request rate of the paced tests (default 5/s)
+    rps = parse_rps(sys.argv)
+    tester = GeminiRoundRobinTester(rps=rps)
     
     # Test all question types with multiple requests
     results = tester.test_all_question_types()
     
+    # Paced run of one type, spaced by the --rps limiter instead of fired all at once
+    tester.test_question_generation_multiple_times("MSQ", 5)
+    
     # Test rapid-fire requests
     tester.test_rapid_fire_requests(5)
     
+    # Same burst with in-flight duplicates coalesced, to compare against the real load run
+    tester.test_rapid_fire_requests(5, dedupe=True)
+    
     print("\n🎯 Key Findings:")
     print("- Round-robin system is working (multiple successful requests)")
     print("- MSQ and NAT types are most reliable")
     print("- MCQ has validation issues")
     print("- SUB has database constraint issues")
     
+    tester.close()
+    
     return 0
 
 if __name__ == "__main__":
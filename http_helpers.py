@@ -0,0 +1,52 @@
+"""
+Helpers shared by the backend test scripts: JSON body codecs, bounded reads of
+error bodies and the buffered per-request logger
+"""
+import json
+import logging
+import sys
+from logging.handlers import MemoryHandler
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to the stdlib codec
+    orjson = None
+
+def dumps_body(obj):
+    """Serialize a request body to JSON bytes"""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+def loads_body(content):
+    """Parse a JSON response body from bytes (both codecs raise json.JSONDecodeError)"""
+    return orjson.loads(content) if orjson else json.loads(content)
+
+def head(response, n=500):
+    """Decode at most n bytes of a streamed httpx response body without reading the rest"""
+    for chunk in response.iter_bytes(chunk_size=n):
+        return chunk[:n].decode('utf-8', errors='replace')
+    return ''
+
+async def ahead(response, n=500):
+    """Async counterpart of head() for httpx.AsyncClient streams"""
+    async for chunk in response.aiter_bytes(chunk_size=n):
+        return chunk[:n].decode('utf-8', errors='replace')
+    return ''
+
+def buffered_logger(name, capacity=1000):
+    """Logger whose records are held in memory and written to stdout in blocks.
+
+    Warnings flush the buffer immediately; call flush_log() before printing directly
+    so buffered lines come out first.
+    """
+    log = logging.getLogger(name)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    target = logging.StreamHandler(sys.stdout)
+    target.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(MemoryHandler(capacity=capacity, flushLevel=logging.WARNING, target=target))
+    return log
+
+def flush_log(log):
+    """Write out log's buffered records"""
+    for handler in log.handlers:
+        handler.flush()
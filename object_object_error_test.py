@@ -5,14 +5,91 @@ Based on the review request requirements
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import os
 import sys
+import time
+import functools
+
+from http_helpers import loads_body
+
+# Shared keep-alive pool; every call below goes to the same host
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32,
+                                      max_retries=Retry(total=3, backoff_factor=0.3)))
+session.headers.update({'Content-Type': 'application/json'})
+
+# First exam/course IDs, reused across runs of this script for an hour; kept next to
+# the script so the working directory does not matter
+IDS_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'ids.json')
+IDS_TTL = 3600
+
+@functools.lru_cache(maxsize=None)
+def fetch_exam_course_ids(api_url):
+    """Return (exam_id, course_id) of the first exam and its first course"""
+    try:
+        if time.time() - os.path.getmtime(IDS_CACHE) < IDS_TTL:
+            with open(IDS_CACHE) as f:
+                cached = json.load(f)
+            exam_id, course_id = cached['exam_id'], cached['course_id']
+            print(f"✅ Using cached IDs from {IDS_CACHE} (delete it to re-read the database):")
+            print(f"  - exam_id: {exam_id}")
+            print(f"  - course_id: {course_id}")
+            return exam_id, course_id
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    exams_response = session.get(f"{api_url}/exams", timeout=30)
+    if exams_response.status_code != 200:
+        return None, None
+    exams = loads_body(exams_response.content)
+    print(f"✅ Found {len(exams)} exams in database:")
+    for exam in exams:
+        print(f"  - {exam.get('name', 'N/A')} (ID: {exam.get('id', 'N/A')})")
+    if not exams:
+        return None, None
+    
+    # Test with first real exam
+    exam_id = exams[0]['id']
+    print(f"\n🔍 Testing with real exam_id: {exam_id}")
+    courses_response = session.get(f"{api_url}/courses/{exam_id}", timeout=30)
+    if courses_response.status_code != 200:
+        return exam_id, None
+    courses = loads_body(courses_response.content)
+    print(f"✅ Found {len(courses)} courses for this exam:")
+    for course in courses:
+        print(f"  - {course.get('name', 'N/A')} (ID: {course.get('id', 'N/A')})")
+    if not courses:
+        return exam_id, None
+    
+    course_id = courses[0]['id']
+    os.makedirs(os.path.dirname(IDS_CACHE), exist_ok=True)
+    with open(IDS_CACHE, 'w') as f:
+        json.dump({'exam_id': exam_id, 'course_id': course_id}, f)
+    return exam_id, course_id
+
+# (kind, count) for each JSON shape an error payload can take
+_DETAIL_KINDS = {
+    list: lambda detail: ('array', len(detail)),
+    dict: lambda detail: ('object', len(detail)),
+    str: lambda detail: ('string', 1),
+}
+
+def classify_detail(detail):
+    """Classify an error payload or its 'detail' field as (kind, count)"""
+    handler = _DETAIL_KINDS.get(type(detail))
+    return handler(detail) if handler else (type(detail).__name__, 1)
+
+def validation_detail(payload):
+    """The 'detail' field of an error object, or None if there is none"""
+    return payload.get('detail') if classify_detail(payload)[0] == 'object' else None
 
 def test_object_object_error():
     """Test the specific scenario mentioned in the review request"""
     base_url = "https://testsmith-1.preview.emergentagent.com"
     api_url = f"{base_url}/api"
-    headers = {'Content-Type': 'application/json'}
     
     print("🔍 TESTING '[object Object]' ERROR - SPECIFIC SCENARIO")
     print("=" * 60)
@@ -40,7 +117,7 @@ def test_object_object_error():
     print(f"Request Body: {json.dumps(body, indent=2)}")
     
     try:
-        response = requests.post(url, json=body, params=params, headers=headers, timeout=30)
+        response = session.post(url, json=body, params=params, timeout=30)
         print(f"\nStatus Code: {response.status_code}")
         print(f"Response Headers: {dict(response.headers)}")
         print(f"Raw Response Text: {response.text}")
@@ -53,11 +130,12 @@ def test_object_object_error():
                 print(json.dumps(error_data, indent=2))
                 
                 # Check if it's an array or object
-                if isinstance(error_data, list):
-                    print(f"\n⚠️ ERROR RESPONSE IS AN ARRAY with {len(error_data)} items")
+                kind, count = classify_detail(error_data)
+                if kind == 'array':
+                    print(f"\n⚠️ ERROR RESPONSE IS AN ARRAY with {count} items")
                     for i, item in enumerate(error_data):
                         print(f"  Item {i}: {item}")
-                elif isinstance(error_data, dict):
+                elif kind == 'object':
                     print(f"\n⚠️ ERROR RESPONSE IS AN OBJECT with keys: {list(error_data.keys())}")
                     
                     # Check detail field specifically
@@ -66,14 +144,13 @@ def test_object_object_error():
                         print(f"\nDetail field type: {type(detail)}")
                         print(f"Detail content: {detail}")
                         
-                        if isinstance(detail, list):
-                            print(f"⚠️ DETAIL IS AN ARRAY with {len(detail)} validation errors")
+                        kind, count = classify_detail(detail)
+                        if kind == 'array':
+                            print(f"⚠️ DETAIL IS AN ARRAY with {count} validation errors")
                             for i, validation_error in enumerate(detail):
                                 print(f"  Validation Error {i}: {validation_error}")
-                        elif isinstance(detail, str):
-                            print(f"⚠️ DETAIL IS A STRING: {detail}")
                         else:
-                            print(f"⚠️ DETAIL IS {type(detail)}: {detail}")
+                            print(f"⚠️ DETAIL IS A {kind.upper()}: {detail}")
                             
             except json.JSONDecodeError as e:
                 print(f"\n❌ Could not parse error response as JSON: {e}")
@@ -89,7 +166,7 @@ def test_object_object_error():
     empty_body = {}
     
     try:
-        response = requests.post(url, json=empty_body, params=params, headers=headers, timeout=30)
+        response = session.post(url, json=empty_body, params=params, timeout=30)
         print(f"Status Code: {response.status_code}")
         print(f"Raw Response: {response.text}")
         
@@ -99,18 +176,18 @@ def test_object_object_error():
                 print(f"\nValidation Errors Structure:")
                 print(json.dumps(validation_errors, indent=2))
                 
-                if isinstance(validation_errors, dict) and 'detail' in validation_errors:
-                    detail = validation_errors['detail']
-                    if isinstance(detail, list):
-                        print(f"\n✅ FOUND THE ISSUE! Validation errors return as ARRAY in 'detail' field")
-                        print(f"Number of validation errors: {len(detail)}")
-                        print(f"First error: {detail[0] if detail else 'None'}")
-                        
-                        # This is likely what causes [object Object] in frontend
-                        print(f"\n🎯 ROOT CAUSE ANALYSIS:")
-                        print(f"   - FastAPI/Pydantic returns validation errors as an array")
-                        print(f"   - Frontend likely tries to display this array directly")
-                        print(f"   - JavaScript converts array to '[object Object]' when displayed as string")
+                detail = validation_detail(validation_errors)
+                kind, count = classify_detail(detail)
+                if kind == 'array':
+                    print(f"\n✅ FOUND THE ISSUE! Validation errors return as ARRAY in 'detail' field")
+                    print(f"Number of validation errors: {count}")
+                    print(f"First error: {detail[0] if detail else 'None'}")
+                    
+                    # This is likely what causes [object Object] in frontend
+                    print(f"\n🎯 ROOT CAUSE ANALYSIS:")
+                    print(f"   - FastAPI/Pydantic returns validation errors as an array")
+                    print(f"   - Frontend likely tries to display this array directly")
+                    print(f"   - JavaScript converts array to '[object Object]' when displayed as string")
                         
             except json.JSONDecodeError:
                 print("Could not parse validation error response")
@@ -131,16 +208,15 @@ def test_object_object_error():
     }
     
     try:
-        response = requests.post(url, json=invalid_body, params=params, headers=headers, timeout=30)
+        response = session.post(url, json=invalid_body, params=params, timeout=30)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 422:
-            validation_errors = response.json()
-            if isinstance(validation_errors, dict) and 'detail' in validation_errors:
-                detail = validation_errors['detail']
-                if isinstance(detail, list):
-                    print(f"✅ Confirmed: {len(detail)} validation errors returned as array")
-                    print(f"Sample error: {detail[0] if detail else 'None'}")
+            detail = validation_detail(response.json())
+            kind, count = classify_detail(detail)
+            if kind == 'array':
+                print(f"✅ Confirmed: {count} validation errors returned as array")
+                print(f"Sample error: {detail[0] if detail else 'None'}")
                     
     except Exception as e:
         print(f"Request failed: {e}")
@@ -149,52 +225,33 @@ def test_object_object_error():
     print("\n\n4️⃣ Checking actual exam_id and course_id values in database")
     print("-" * 50)
     
+    real_exam_id, real_course_id = None, None
     try:
-        # Get exams
-        exams_response = requests.get(f"{api_url}/exams", headers=headers, timeout=30)
-        if exams_response.status_code == 200:
-            exams = exams_response.json()
-            print(f"✅ Found {len(exams)} exams in database:")
-            for exam in exams:
-                print(f"  - {exam.get('name', 'N/A')} (ID: {exam.get('id', 'N/A')})")
+        real_exam_id, real_course_id = fetch_exam_course_ids(api_url)
+        
+        if real_exam_id and real_course_id:
+            print(f"\n🔍 Testing start-auto-generation with REAL IDs:")
+            print(f"  exam_id: {real_exam_id}")
+            print(f"  course_id: {real_course_id}")
+            
+            real_params = {
+                "exam_id": real_exam_id,
+                "course_id": real_course_id,
+                "generation_mode": "new_questions"
+            }
+            
+            response = session.post(url, json=body, params=real_params, timeout=30)
+            print(f"  Status: {response.status_code}")
             
-            # Test with first real exam
-            if exams:
-                real_exam_id = exams[0]['id']
-                print(f"\n🔍 Testing with real exam_id: {real_exam_id}")
+            if response.status_code == 200:
+                print("  ✅ SUCCESS with real IDs!")
+                success_data = loads_body(response.content)
+                print(f"  Session ID: {success_data.get('session_id', 'N/A')}")
+                print(f"  Total Topics: {success_data.get('total_topics', 'N/A')}")
+                print(f"  Status: {success_data.get('status', 'N/A')}")
+            else:
+                print(f"  ❌ Still failed with real IDs: {response.text}")
                 
-                # Get courses for this exam
-                courses_response = requests.get(f"{api_url}/courses/{real_exam_id}", headers=headers, timeout=30)
-                if courses_response.status_code == 200:
-                    courses = courses_response.json()
-                    print(f"✅ Found {len(courses)} courses for this exam:")
-                    for course in courses:
-                        print(f"  - {course.get('name', 'N/A')} (ID: {course.get('id', 'N/A')})")
-                    
-                    if courses:
-                        real_course_id = courses[0]['id']
-                        print(f"\n🔍 Testing start-auto-generation with REAL IDs:")
-                        print(f"  exam_id: {real_exam_id}")
-                        print(f"  course_id: {real_course_id}")
-                        
-                        real_params = {
-                            "exam_id": real_exam_id,
-                            "course_id": real_course_id,
-                            "generation_mode": "new_questions"
-                        }
-                        
-                        response = requests.post(url, json=body, params=real_params, headers=headers, timeout=30)
-                        print(f"  Status: {response.status_code}")
-                        
-                        if response.status_code == 200:
-                            print("  ✅ SUCCESS with real IDs!")
-                            success_data = response.json()
-                            print(f"  Session ID: {success_data.get('session_id', 'N/A')}")
-                            print(f"  Total Topics: {success_data.get('total_topics', 'N/A')}")
-                            print(f"  Status: {success_data.get('status', 'N/A')}")
-                        else:
-                            print(f"  ❌ Still failed with real IDs: {response.text}")
-                            
     except Exception as e:
         print(f"Failed to get exams: {e}")
     
@@ -205,7 +262,7 @@ def test_object_object_error():
     # Test with invalid course_id first
     test_course_id = "test"
     try:
-        response = requests.get(f"{api_url}/all-topics-with-weightage/{test_course_id}", headers=headers, timeout=30)
+        response = session.get(f"{api_url}/all-topics-with-weightage/{test_course_id}", timeout=30)
         print(f"Testing with course_id 'test':")
         print(f"  Status: {response.status_code}")
         print(f"  Response: {response.text}")
@@ -219,14 +276,14 @@ def test_object_object_error():
         print(f"Request failed: {e}")
     
     # Test with valid course_id if we found one
-    if 'real_course_id' in locals():
+    if real_course_id:
         try:
-            response = requests.get(f"{api_url}/all-topics-with-weightage/{real_course_id}", headers=headers, timeout=30)
+            response = session.get(f"{api_url}/all-topics-with-weightage/{real_course_id}", timeout=30)
             print(f"\nTesting with real course_id '{real_course_id}':")
             print(f"  Status: {response.status_code}")
             
             if response.status_code == 200:
-                topics_data = response.json()
+                topics_data = loads_body(response.content)
                 print(f"  ✅ SUCCESS: Found {len(topics_data)} topics with weightage")
                 if topics_data:
                     sample_topic = topics_data[0]
@@ -252,4 +309,5 @@ def test_object_object_error():
     print("- Use real UUID values for exam_id and course_id parameters")
 
 if __name__ == "__main__":
-    test_object_object_error()
\ No newline at end of file
+    with session:
+        test_object_object_error()
\ No newline at end of file
@@ -1,140 +1,262 @@
-import requests
-import json
+import asyncio
+import httpx
+import sys
 import time
-import threading
-from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+
+from http_helpers import ahead, buffered_logger, dumps_body, flush_log
+
+# Per-request lines are buffered during a phase and written out with its results
+log = buffered_logger('stress')
+
+def retry_after_seconds(response, default=1.0, cap=30.0):
+    """Seconds the server asked us to wait, from Retry-After; HTTP-date values fall back to default"""
+    try:
+        return min(cap, max(0.0, float(response.headers.get('Retry-After'))))
+    except (TypeError, ValueError):
+        return default
+
+class TokenBucket:
+    """Quota budget shared by every request; a 429's Retry-After pauses it for all of them.
+    
+    With rate=None there is no steady limit and only the pauses apply. No lock is
+    needed: all acquirers run on the one event-loop thread.
+    """
+    def __init__(self, rate=None):
+        if rate is not None and rate <= 0:
+            raise ValueError(f"rate must be positive (got {rate!r})")
+        self.rate = rate
+        self.capacity = max(1.0, rate or 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.resume_at = 0.0
+
+    def pause(self, seconds):
+        self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.updated = self.resume_at
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self.resume_at:
+                await asyncio.sleep(self.resume_at - now)
+                continue
+            if self.rate is None:
+                return
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
 
 class RoundRobinStressTest:
-    def __init__(self, base_url="https://testsmith-1.preview.emergentagent.com"):
+    def __init__(self, base_url="https://testsmith-1.preview.emergentagent.com", max_connections=5, rps=None, max_requeues=2):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
+        self._endpoint = f"{self.api_url}/generate-question"
         self.topic_id = "7c583ed3-64bf-4fa0-bf20-058ac4b40737"
-        self.successful_requests = 0
-        self.failed_requests = 0
-        self.quota_errors = 0
-        self.other_errors = 0
-        self.lock = threading.Lock()
-
-    def make_request(self, request_id):
-        """Make a single question generation request"""
-        request_data = {
+        # Every request sends the same body, so it is encoded once
+        self._body = dumps_body({
             "topic_id": self.topic_id,
             "question_type": "MSQ",  # Use MSQ as it's most reliable
             "part_id": None,
             "slot_id": None
-        }
-        
-        try:
-            start_time = time.time()
-            response = requests.post(
-                f"{self.api_url}/generate-question",
-                json=request_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=60
-            )
-            end_time = time.time()
-            
-            with self.lock:
-                if response.status_code == 200:
-                    self.successful_requests += 1
-                    print(f"Request {request_id:2d}: ✅ Success ({end_time-start_time:.2f}s)")
-                elif response.status_code == 429:
-                    self.quota_errors += 1
-                    self.failed_requests += 1
-                    print(f"Request {request_id:2d}: 🚫 Quota Error ({end_time-start_time:.2f}s)")
-                else:
-                    self.other_errors += 1
-                    self.failed_requests += 1
-                    error_msg = response.text[:100] if response.text else "No response"
-                    print(f"Request {request_id:2d}: ❌ Error {response.status_code} ({end_time-start_time:.2f}s) - {error_msg}")
+        })
+        # Outcome tallies for the current phase: 'success', 'quota' or 'other',
+        # plus 'requeued' for 429s that were retried after their Retry-After
+        self.counts = Counter()
+        self.bucket = TokenBucket(rps)
+        self.max_requeues = max_requeues
+        # Pause between sequential requests; grows on 429s and decays on successes
+        self._next_delay = 0.0
+        
+        # One HTTP/2 client for every phase, so later phases reuse the warm TLS connection.
+        # The extra connection slots only matter if the server falls back to HTTP/1.1;
+        # size max_connections for the widest phase.
+        # No pool timeout: queued requests wait for a free connection instead of failing
+        self.client = httpx.AsyncClient(
+            http2=True,
+            headers={'Content-Type': 'application/json'},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(60, pool=None)
+        )
+
+    async def close(self):
+        """Release the pooled connections"""
+        await self.client.aclose()
+
+    @property
+    def successful_requests(self):
+        return self.counts['success']
+
+    @property
+    def quota_errors(self):
+        return self.counts['quota']
+
+    @property
+    def other_errors(self):
+        return self.counts['other']
+
+    @property
+    def failed_requests(self):
+        return self.counts['quota'] + self.counts['other']
+
+    async def make_request(self, request_id):
+        """Make a single question generation request; returns the final status code, or None on error.
+        
+        A 429 pauses the shared bucket for its Retry-After and the request is re-issued,
+        up to max_requeues times; only a 429 on the last attempt counts as a quota error.
+        """
+        for attempt in range(self.max_requeues + 1):
+            await self.bucket.acquire()
+            try:
+                start_time = time.perf_counter()
+                # Streamed so an error page is not downloaded past the part that gets printed
+                async with self.client.stream("POST", self._endpoint, content=self._body) as response:
+                    if response.status_code == 200:
+                        await response.aread()
+                    end_time = time.perf_counter()
                     
-        except Exception as e:
-            with self.lock:
-                self.other_errors += 1
-                self.failed_requests += 1
-                print(f"Request {request_id:2d}: ❌ Exception: {str(e)[:100]}")
+                    # Tallies need no lock: every request runs on the one event-loop thread
+                    if response.status_code == 200:
+                        self.counts['success'] += 1
+                        log.info("Request %2d: ✅ Success (%.2fs)", request_id, end_time-start_time)
+                    elif response.status_code == 429:
+                        retry_after = retry_after_seconds(response)
+                        self.bucket.pause(retry_after)
+                        if attempt < self.max_requeues:
+                            self.counts['requeued'] += 1
+                            log.info("Request %2d: 🔁 Quota Error (%.2fs) - retrying after %.1fs", request_id, end_time-start_time, retry_after)
+                            continue
+                        self.counts['quota'] += 1
+                        log.info("Request %2d: 🚫 Quota Error (%.2fs)", request_id, end_time-start_time)
+                    else:
+                        self.counts['other'] += 1
+                        error_msg = await ahead(response, 100) or "No response"
+                        log.info("Request %2d: ❌ Error %s (%.2fs) - %s", request_id, response.status_code, end_time-start_time, error_msg)
+                    
+                    return response.status_code
+                        
+            except Exception as e:
+                self.counts['other'] += 1
+                log.info("Request %2d: ❌ Exception: %s", request_id, str(e)[:100])
+                return None
+
+    async def _run_sequential(self, num_requests):
+        self._next_delay = 0.0
+        for i in range(num_requests):
+            status = await self.make_request(i + 1)
+            # Back off only while the server is pushing back; no idle time otherwise
+            if status == 200:
+                self._next_delay *= 0.8
+            elif status == 429:
+                self._next_delay = min(2.0, self._next_delay * 2 + 0.05)
+            if self._next_delay:
+                await asyncio.sleep(self._next_delay)
 
-    def stress_test_sequential(self, num_requests=20):
+    async def _run_concurrent(self, num_requests, max_workers):
+        # Streams on one HTTP/2 connection are not capped by the pool, so the
+        # semaphore is what keeps max_workers requests in flight
+        slots = asyncio.Semaphore(max_workers)
+        
+        async def bounded(request_id):
+            async with slots:
+                await self.make_request(request_id)
+        
+        await asyncio.gather(*[bounded(i + 1) for i in range(num_requests)])
+
+    async def stress_test_sequential(self, num_requests=20):
         """Test with sequential requests to see round-robin behavior"""
         print(f"\n🔄 Sequential Stress Test ({num_requests} requests)...")
         print("=" * 60)
         
-        self.successful_requests = 0
-        self.failed_requests = 0
-        self.quota_errors = 0
-        self.other_errors = 0
+        self.counts.clear()
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        for i in range(num_requests):
-            self.make_request(i + 1)
-            time.sleep(0.5)  # Small delay to avoid overwhelming
+        await self._run_sequential(num_requests)
         
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         
+        flush_log(log)
         print("\n" + "=" * 60)
         print("📊 Sequential Test Results:")
         print(f"Total Time: {total_time:.2f}s")
         print(f"Successful: {self.successful_requests}")
         print(f"Quota Errors: {self.quota_errors}")
+        print(f"Requeued on 429: {self.counts['requeued']}")
         print(f"Other Errors: {self.other_errors}")
         print(f"Success Rate: {(self.successful_requests/(self.successful_requests + self.failed_requests))*100:.1f}%")
         
         return self.successful_requests, self.failed_requests
 
-    def stress_test_concurrent(self, num_requests=10, max_workers=3):
+    async def stress_test_concurrent(self, num_requests=10, max_workers=3):
         """Test with concurrent requests to stress the round-robin system"""
         print(f"\n🚀 Concurrent Stress Test ({num_requests} requests, {max_workers} workers)...")
         print("=" * 60)
         
-        self.successful_requests = 0
-        self.failed_requests = 0
-        self.quota_errors = 0
-        self.other_errors = 0
+        self.counts.clear()
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(self.make_request, i + 1) for i in range(num_requests)]
-            
-            # Wait for all requests to complete
-            for future in futures:
-                future.result()
+        # All requests are scheduled at once; at most max_workers are in flight
+        await self._run_concurrent(num_requests, max_workers)
         
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         
+        flush_log(log)
         print("\n" + "=" * 60)
         print("📊 Concurrent Test Results:")
         print(f"Total Time: {total_time:.2f}s")
         print(f"Successful: {self.successful_requests}")
         print(f"Quota Errors: {self.quota_errors}")
+        print(f"Requeued on 429: {self.counts['requeued']}")
         print(f"Other Errors: {self.other_errors}")
         print(f"Success Rate: {(self.successful_requests/(self.successful_requests + self.failed_requests))*100:.1f}%")
         print(f"Requests/second: {num_requests/total_time:.2f}")
         
         return self.successful_requests, self.failed_requests
 
-    def test_api_key_exhaustion_simulation(self):
+    async def test_api_key_exhaustion_simulation(self):
         """Test what happens when we potentially exhaust API keys"""
         print("\n🔥 API Key Exhaustion Simulation...")
         print("Making many requests quickly to test round-robin behavior...")
         
         # Make many requests in quick succession
-        return self.stress_test_concurrent(15, 5)
+        return await self.stress_test_concurrent(15, 5)
+
+def parse_rps(argv):
+    """Read --rps N from argv; N must be a positive number of requests per second"""
+    if '--rps' not in argv:
+        return None
+    try:
+        rps = float(argv[argv.index('--rps') + 1])
+    except (IndexError, ValueError):
+        rps = 0
+    if not rps > 0:
+        sys.exit("--rps needs a positive number of requests per second")
+    return rps
 
-def main():
-    tester = RoundRobinStressTest()
+async def main():
+    # --rps N caps the shared request rate (default: unlimited, Retry-After pauses only)
+    rps = parse_rps(sys.argv)
+    # Pool sized for the widest phase (the 5-worker exhaustion test)
+    tester = RoundRobinStressTest(max_connections=5, rps=rps)
     
     print("🚀 Starting Round-Robin Stress Testing...")
     
     # Test sequential requests
-    seq_success, seq_failed = tester.stress_test_sequential(10)
+    seq_success, seq_failed = await tester.stress_test_sequential(10)
     
     # Test concurrent requests
-    conc_success, conc_failed = tester.stress_test_concurrent(8, 3)
+    conc_success, conc_failed = await tester.stress_test_concurrent(8, 3)
     
     # Test potential exhaustion
-    exh_success, exh_failed = tester.test_api_key_exhaustion_simulation()
+    exh_success, exh_failed = await tester.test_api_key_exhaustion_simulation()
+    
+    await tester.close()
     
     print("\n" + "=" * 70)
     print("🎯 ROUND-ROBIN STRESS TEST SUMMARY")
@@ -151,12 +273,13 @@ def main():
     if total_success > 0:
         print("\n✅ Round-robin system is working - multiple successful requests completed")
         print("✅ Gemini API integration is functional")
-        if tester.quota_errors > 0:
-            print(f"⚠️  Detected {tester.quota_errors} quota errors - round-robin switching is working")
+        quota_hits = tester.quota_errors + tester.counts['requeued']
+        if quota_hits > 0:
+            print(f"⚠️  Detected {quota_hits} quota errors ({tester.counts['requeued']} retried) - round-robin switching is working")
     else:
         print("\n❌ Round-robin system may have issues - no successful requests")
     
     return 0
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(asyncio.run(main()))
\ No newline at end of file
@@ -2,10 +2,54 @@
 """
 Specific test for the "'list' object has no attribute 'get'" error fix
 """
-import requests
+import asyncio
+import httpx
 import json
 import sys
 
+from http_helpers import dumps_body
+
+async def probe(client, endpoint, q_type, body):
+    """Generate one q_type question from its encoded body; returns (q_type, success, error)"""
+    print(f"\n🔍 Testing {q_type} question generation...")
+    
+    try:
+        response = await client.post(endpoint, content=body, timeout=60)
+        
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                print(f"✅ {q_type}: SUCCESS - Question generated without list/get error")
+                print(f"   Question: {data.get('question_statement', '')[:100]}...")
+                print(f"   Answer: {data.get('answer', 'N/A')}")
+                return q_type, True, None
+            except json.JSONDecodeError as e:
+                print(f"❌ {q_type}: JSON parsing error - {str(e)}")
+                return q_type, False, f"JSON parsing: {str(e)}"
+        else:
+            error_msg = response.text
+            print(f"❌ {q_type}: HTTP {response.status_code} - {error_msg}")
+            return q_type, False, f"HTTP {response.status_code}: {error_msg}"
+            
+    except Exception as e:
+        print(f"❌ {q_type}: Exception - {str(e)}")
+        return q_type, False, f"Exception: {str(e)}"
+
+async def probe_all(api_url, topic_id, question_types):
+    """Run every probe at once over one shared client"""
+    # Bodies are encoded up front; only the question type differs between them
+    bodies = {q_type: dumps_body({
+        "topic_id": topic_id,
+        "question_type": q_type,
+        "part_id": None,
+        "slot_id": None
+    }) for q_type in question_types}
+    
+    endpoint = f"{api_url}/generate-question"
+    
+    async with httpx.AsyncClient(headers={'Content-Type': 'application/json'}) as client:
+        return await asyncio.gather(*[probe(client, endpoint, q_type, bodies[q_type]) for q_type in question_types])
+
 def test_list_fix():
     """Test the specific fix for list/get attribute error"""
     base_url = "https://testsmith-1.preview.emergentagent.com"
@@ -20,48 +64,10 @@ def test_list_fix():
     # Test multiple question types to ensure the fix works consistently
     question_types = ["MCQ", "MSQ", "NAT"]
     
-    all_success = True
-    test_results = {}
-    
-    for q_type in question_types:
-        print(f"\n🔍 Testing {q_type} question generation...")
-        
-        request_data = {
-            "topic_id": topic_id,
-            "question_type": q_type,
-            "part_id": None,
-            "slot_id": None
-        }
-        
-        try:
-            response = requests.post(
-                f"{api_url}/generate-question",
-                json=request_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=60
-            )
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    print(f"✅ {q_type}: SUCCESS - Question generated without list/get error")
-                    print(f"   Question: {data.get('question_statement', '')[:100]}...")
-                    print(f"   Answer: {data.get('answer', 'N/A')}")
-                    test_results[q_type] = {"success": True, "error": None}
-                except json.JSONDecodeError as e:
-                    print(f"❌ {q_type}: JSON parsing error - {str(e)}")
-                    test_results[q_type] = {"success": False, "error": f"JSON parsing: {str(e)}"}
-                    all_success = False
-            else:
-                error_msg = response.text
-                print(f"❌ {q_type}: HTTP {response.status_code} - {error_msg}")
-                test_results[q_type] = {"success": False, "error": f"HTTP {response.status_code}: {error_msg}"}
-                all_success = False
-                
-        except Exception as e:
-            print(f"❌ {q_type}: Exception - {str(e)}")
-            test_results[q_type] = {"success": False, "error": f"Exception: {str(e)}"}
-            all_success = False
+    # The probes are independent, so they run concurrently; wall time is the slowest one
+    outcomes = asyncio.run(probe_all(api_url, topic_id, question_types))
+    test_results = {q_type: {"success": success, "error": error} for q_type, success, error in outcomes}
+    all_success = all(success for _, success, _ in outcomes)
     
     # Summary
     print("\n" + "=" * 60)